@@ -0,0 +1,136 @@
+"""Operator view of the app's process-wide state.
+
+Opened with ``?admin=<token>`` when the ``VN_ADMIN_TOKEN`` environment variable
+is set to the same token; without that variable the view is disabled. It shows
+the live cohort benchmark, the figures the shared caches, the response
+store and the session accounting collect while the server runs, and a
+download of every stored response.
+"""
+import hmac  # For constant-time token comparison
+import os  # For the admin token
+import sys  # For the lazily imported report modules
+
+import streamlit as st
+
+
+def admin_requested():
+    """
+    Check whether the current request opens the admin view.
+    Returns:
+        bool: True if ``?admin=`` matches VN_ADMIN_TOKEN.
+    """
+    token = os.environ.get("VN_ADMIN_TOKEN", "")
+    supplied = st.query_params.get("admin", "")
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+
+def _kib(size):
+    return f"{size / 1024:,.1f} KiB"
+
+
+def render_admin_panel():
+    """Render the admin view."""
+    from assets import asset_cache
+    from cohort import BUSINESS_UNIT, ORG, cohort_aggregates
+    from export import export_file
+    from metrics import metrics
+    from response_store import response_store
+    from session_memory import session_memory
+    from session_spill import session_spill
+
+    st.write("## 🛠️ The Virtual Narrative: Admin")
+
+    # ✅ Memory held per session, idle sessions included
+    st.write("### 🧠 Session Memory")
+    memory = session_memory.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Sessions", memory["sessions"])
+    col2.metric("Average per session", _kib(memory["average_bytes"]))
+    col3.metric("Largest session", _kib(memory["max_bytes"]))
+    col4.metric("All sessions", _kib(memory["total_bytes"]))
+    spill = session_spill.stats()
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Tracked for spilling", spill["tracked"])
+    col2.metric("Spilled to disk", spill["spilled"])
+    col3.metric("Resumed", spill["resumed"])
+    col4.metric("Idle timeout", f"{spill['idle_seconds']:.0f} s")
+
+    # ✅ Live cohort benchmark, read from the running aggregates
+    st.write("### 📊 Cohort Benchmark")
+    cohort = cohort_aggregates.summary()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Respondents", cohort["respondents"])
+    col2.metric("Average maturity score", f"{cohort['overall_mean']:.2f}/5")
+    col3.metric("Standard deviation", f"{cohort['overall_std']:.2f}")
+    if cohort["respondents"]:
+        st.write("**Average score per section**")
+        st.bar_chart({"Section": list(cohort["section_mean"]), "Average score": list(cohort["section_mean"].values())}, x="Section", y="Average score")
+        st.write("**Respondents per maturity level**")
+        st.bar_chart({"Maturity level": list(cohort["levels"]), "Respondents": list(cohort["levels"].values())}, x="Maturity level", y="Respondents")
+
+        split_label = st.radio("Split by", ("Organization", "Business unit"), horizontal=True)
+        split = cohort_aggregates.split(ORG if split_label == "Organization" else BUSINESS_UNIT)
+        st.dataframe([
+            {split_label: name, "Respondents": group["respondents"], "Average score": round(group["overall_mean"], 2),
+             **{title: round(mean, 2) for title, mean in group["section_mean"].items()}}
+            for name, group in split.items()
+        ], hide_index=True)
+
+    # ✅ Response store writer
+    st.write("### 💾 Response Store")
+    st.json(response_store.stats())
+
+    # ✅ Export of every stored assessment, generated only when asked for
+    st.write("### 📤 Export Responses")
+    st.caption("The export is built in server memory before it is offered for download. "
+               "For a large response store, run `python export.py -o responses.xlsx` on the server instead: it streams with constant memory.")
+    export_format = st.radio("Format", ("Excel", "CSV"), horizontal=True)
+    extension = ".xlsx" if export_format == "Excel" else ".csv"
+    if st.button("Prepare export"):
+        skipped = []
+        with st.status("Preparing export...") as status:
+            export = export_file(  # Kept for this run only, not in the session state
+                extension,
+                progress=lambda count: status.update(label=f"Preparing export... {count:,} submissions scored"),
+                skipped=skipped,
+            )
+            status.update(label=f"Export ready ({_kib(len(export))})", state="complete")
+        if skipped:
+            st.warning(f"{len(skipped)} stored submission(s) could not be scored and were left out of the export.")
+            st.dataframe([{"Submission id": submission_id, "Error": error} for submission_id, error in skipped], hide_index=True)
+        st.download_button(
+            f"Download responses ({_kib(len(export))})",
+            data=export,
+            file_name=f"responses{extension}",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet" if extension == ".xlsx" else "text/csv",
+            on_click="ignore",  # No rerun, so the button stays until the next interaction
+        )
+
+    # ✅ Timing histograms, also served to Prometheus when VN_METRICS_PORT or VN_METRICS_FILE is set
+    st.write("### ⏱️ Timing")
+    sample_rate = st.slider("Share of spans recorded", 0.0, 1.0, metrics.sample_rate, step=0.05)
+    if sample_rate != metrics.sample_rate:
+        metrics.set_sample_rate(sample_rate)
+    spans = metrics.snapshot()
+    if spans:
+        st.dataframe([
+            {"Span": span, "Page": page, "Section": section, "Count": stats["count"], "Mean (ms)": round(stats["mean_s"] * 1000, 2)}
+            for (span, page, section), stats in spans.items()
+        ], hide_index=True)
+    for error in metrics.exporter_errors:
+        st.warning(error)
+    with st.expander("Prometheus exposition"):
+        st.code(metrics.render(), language="text")
+
+    # ✅ Shared caches
+    st.write("### ⚡ Caches")
+    st.write("**Static assets**")
+    st.json(asset_cache.stats())
+    if "report" in sys.modules:  # Only loaded once a respondent reached the results page
+        st.write("**PDF reports**")
+        st.json(sys.modules["report"].report_cache.stats())
+        st.write("**PDF render service**")
+        st.json(sys.modules["report"].render_service.stats())
+    if "charts" in sys.modules:
+        st.write("**Gauge figures**")
+        st.json(sys.modules["charts"].gauge_cache_stats())
@@ -0,0 +1,142 @@
+"""Process-wide cache for the static assets used by virtual_narrative.py.
+
+Streamlit re-executes the whole script on every interaction, so anything the
+script loads at top level (the logo, the privacy policy, the landing-page
+markup) is loaded again on each rerun. Objects held by this module live for the
+lifetime of the server process instead, and are shared by every session.
+"""
+import base64  # For building data URIs
+import hashlib  # For versioning static file URLs
+import os  # For file path handling
+import threading  # Sessions run on separate script threads
+import time  # For throttling mtime checks
+
+# Directory the assets are resolved against (the repository root)
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Files Streamlit serves at app/static/ when server.enableStaticServing is on
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+
+
+def read_bytes(path):
+    """Loader returning the raw contents of a file."""
+    with open(path, "rb") as file:
+        return file.read()
+
+
+def read_text(path):
+    """Loader returning the contents of a UTF-8 text file."""
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def png_data_uri(path):
+    """Loader returning a PNG file as a base64 ``data:`` URI."""
+    return "data:image/png;base64," + base64.b64encode(read_bytes(path)).decode()
+
+
+def static_url(path):
+    """
+    Loader returning the URL Streamlit serves a file of ``static/`` at.
+    The URL carries a content hash, so a changed file gets a new URL while an
+    unchanged one keeps hitting the browser cache.
+    """
+    digest = hashlib.sha1(read_bytes(path)).hexdigest()[:12]
+    relative = os.path.relpath(path, STATIC_DIR).replace(os.sep, "/")
+    return f"app/static/{relative}?v={digest}"
+
+
+def stylesheet_link(path):
+    """Loader returning a ``<link>`` tag for a stylesheet in ``static/``."""
+    return f'<link rel="stylesheet" href="{static_url(path)}">'
+
+
+def inline_stylesheet(path):
+    """Loader returning a stylesheet as an inline ``<style>`` block."""
+    return f"<style>\n{read_text(path)}</style>"
+
+
+class AssetCache:
+    """
+    Thread-safe cache of file-backed assets, invalidated by modification time.
+    Args:
+        base_dir (str): Directory relative asset paths are resolved against.
+        check_interval (float): Minimum seconds between two mtime checks of the
+            same asset, so a burst of reruns costs at most one stat() call.
+    """
+
+    def __init__(self, base_dir=BASE_DIR, check_interval=2.0):
+        self.base_dir = base_dir
+        self.check_interval = check_interval
+        self._entries = {}  # (name, path) -> [mtime, checked_at, value]
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, path, loader=read_bytes, name=None):
+        """
+        Return the cached value for an asset, loading it on first use or when
+        the file has changed on disk.
+        Args:
+            path (str): Asset path, relative to ``base_dir``.
+            loader (callable): Called with the absolute path to build the value.
+            name (str): Cache slot name; defaults to the loader's name. Pass one
+                when several values are derived from the same file.
+        Returns:
+            The value returned by ``loader``.
+        Raises:
+            FileNotFoundError: If the asset does not exist.
+        """
+        key = (name or loader.__name__, path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] < self.check_interval:
+                self.hits += 1
+                return entry[2]
+
+        full_path = os.path.join(self.base_dir, path)
+        try:
+            mtime = os.stat(full_path).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock:
+                self._entries.pop(key, None)
+            raise
+
+        with self._lock:
+            if entry is not None and entry[0] == mtime:
+                entry[1] = now
+                self.hits += 1
+                return entry[2]
+
+        value = loader(full_path)
+        with self._lock:
+            self._entries[key] = [mtime, now, value]
+            self.misses += 1
+        return value
+
+    def clear(self):
+        """Drop every cached asset and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Report cache effectiveness.
+        Returns:
+            dict: Hit and miss counts, hit rate and number of cached entries.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+# ✅ Shared instance used by every session of the app
+asset_cache = AssetCache()
@@ -0,0 +1,266 @@
+"""Offline batch scoring of assessment submissions.
+
+Scores paper and Excel submissions with exactly the logic the app uses: the
+weighting formula, the maturity thresholds and the insight rules.
+
+Input is a CSV or JSONL file with one submission per row. Each question of the
+question bank is a column named after its key (``gov_q1`` ... ``sp3``) holding
+the selected option's score (1-5). The weighting priorities go in the ``q0`` ...
+``q5`` columns; when all six are blank the app's default weights are used. Any
+other column (respondent id, organization, ...) is copied to the output as-is;
+the output header is taken from the first row, so a later JSONL row with a
+column the first one lacks is an error rather than silently dropped.
+
+Usage:
+    python batch_score.py submissions.csv -o scores.xlsx --workers 8
+"""
+import argparse  # For the command-line interface
+import csv  # For streaming CSV input and output
+import itertools  # For chunking the input stream
+import json  # For JSONL input
+import os  # For CPU count and file extensions
+import sys  # For progress reporting on stderr
+import time  # For throughput measurement
+from collections import deque  # For bounding the number of chunks in flight
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from insights import insight_engine
+from questionnaire import SECTIONS, WEIGHTING_QUESTIONS, default_weights
+from scoring import (MATURITY_LEVELS, QUESTIONS_PER_SECTION, SECTION_TITLES,
+                     score_assessment, weights_from_priorities, weights_vector)
+
+ANSWER_COLUMNS = tuple(question.key for section in SECTIONS for question in section.questions)
+PRIORITY_COLUMNS = tuple(question.key for question in WEIGHTING_QUESTIONS)
+
+# Output columns appended after the pass-through columns of each submission
+SCORE_COLUMNS = (
+    tuple(f"{title} Score" for title in SECTION_TITLES)
+    + tuple(f"{title} Weighted Score" for title in SECTION_TITLES)
+    + ("Weighted Average Score", "Maturity Level", "Insights")
+)
+
+
+def iter_submissions(path):
+    """
+    Stream submissions from a CSV or JSONL file, one dict per row.
+    Args:
+        path (str): Input file; ``.jsonl``/``.ndjson`` files are read as JSON lines.
+    Yields:
+        dict: Column name to value.
+    """
+    if os.path.splitext(path)[1].lower() in (".jsonl", ".ndjson"):
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(path, "r", encoding="utf-8-sig", newline="") as file:
+            yield from csv.DictReader(file)
+
+
+def chunked(iterable, size):
+    """Yield successive lists of at most ``size`` items."""
+    iterator = iter(iterable)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _score_value(row, key, valid, line):
+    """Read one integer score from a submission, validating it against the question."""
+    value = row.get(key)
+    try:
+        number = float(value)  # "3", "3.0" and 3 from Excel or JSON are all the score 3
+    except (TypeError, ValueError):
+        raise ValueError(f"Submission {line}: '{key}' must be a score, got {value!r}") from None
+    if not number.is_integer():
+        raise ValueError(f"Submission {line}: '{key}' must be a whole score, got {value!r}")
+    score = int(number)
+    if score not in valid:
+        raise ValueError(f"Submission {line}: '{key}' must be one of {sorted(valid)}, got {score}")
+    return score
+
+
+def parse_submissions(rows, first_line=1, with_priorities=False):
+    """
+    Convert submissions to the arrays expected by scoring.score_assessment.
+    Args:
+        rows (list): Submissions as dicts.
+        first_line (int): Position of the first row in the input, for error messages.
+        with_priorities (bool): Also return the (n, sections) priority scores,
+            NaN for submissions that use the default weights.
+    Returns:
+        tuple: (n, sections, questions) answer scores and (n, sections) weights,
+        then the priorities if asked for.
+    Raises:
+        ValueError: If a submission has a missing, fractional or out-of-range score.
+    """
+    answers = np.zeros((len(rows), len(SECTIONS), QUESTIONS_PER_SECTION), dtype=np.int64)
+    priorities = np.zeros((len(rows), len(WEIGHTING_QUESTIONS)), dtype=np.float64)
+    defaults = weights_vector(default_weights())  # Already normalized, so they pass through unchanged
+    defaulted = np.zeros(len(rows), dtype=bool)
+    for n, row in enumerate(rows):
+        line = first_line + n
+        for s, section in enumerate(SECTIONS):
+            for q, question in enumerate(section.questions):
+                answers[n, s, q] = _score_value(row, question.key, question.scores, line)
+        if all(row.get(key) in (None, "") for key in PRIORITY_COLUMNS):
+            priorities[n] = defaults
+            defaulted[n] = True
+        else:
+            for i, question in enumerate(WEIGHTING_QUESTIONS):
+                priorities[n, i] = _score_value(row, question.key, question.scores, line)
+    weights = weights_from_priorities(priorities)
+    if with_priorities:
+        priorities[defaulted] = np.nan
+        return answers, weights, priorities
+    return answers, weights
+
+
+def score_chunk(rows, first_line=1):
+    """
+    Score a chunk of submissions; runs in a worker process.
+    Args:
+        rows (list): Submissions as dicts.
+        first_line (int): Position of the first row in the input.
+    Returns:
+        list: Output rows, the input columns followed by SCORE_COLUMNS.
+    """
+    answers, weights = parse_submissions(rows, first_line)
+    scores = score_assessment(answers, weights)
+    bands = insight_engine.bands(scores.section_scores, answers)
+    results = []
+    for n, row in enumerate(rows):
+        insights = insight_engine.insights(bands[n])
+        values = (
+            [round(score, 4) for score in scores.section_scores[n].tolist()]
+            + [round(score, 4) for score in scores.weighted_scores[n].tolist()]
+            + [round(float(scores.overall[n]), 4), MATURITY_LEVELS[scores.level[n]].label, "\n".join(insight.text for insight in insights)]
+        )
+        results.append({**row, **dict(zip(SCORE_COLUMNS, values))})
+    return results
+
+
+def score_file(path, chunk_size=1000, workers=None):
+    """
+    Score a submissions file across a process pool, preserving input order.
+    Args:
+        path (str): CSV or JSONL submissions file.
+        chunk_size (int): Submissions per task sent to a worker.
+        workers (int): Worker processes; defaults to the CPU count.
+    Yields:
+        list: Scored output rows, one list per chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        first_line = 1
+        for chunk in chunked(iter_submissions(path), chunk_size):
+            pending.append(executor.submit(score_chunk, chunk, first_line))
+            first_line += len(chunk)
+            # Keep a couple of chunks per worker in flight so memory stays bounded
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _check_columns(row, columns):
+    """Reject a row with columns missing from the header, instead of dropping them."""
+    if not row.keys() <= columns.keys():
+        unknown = ", ".join(str(key) for key in row if key not in columns)
+        raise ValueError(f"Columns not in the output header: {unknown}. Every row must have the columns of the first row.")
+
+
+class _CsvSink:
+    """Streaming CSV writer; the header is ``columns``, or else the first row's keys."""
+
+    def __init__(self, path, columns=None):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._columns = columns
+        self._writer = None
+
+    def write(self, row):
+        if self._writer is None:
+            self._columns = dict.fromkeys(self._columns or row)
+            self._writer = csv.DictWriter(self._file, fieldnames=list(self._columns))
+            self._writer.writeheader()
+        _check_columns(row, self._columns)
+        self._writer.writerow(row)
+
+    def close(self):
+        self._file.close()
+
+
+class _ExcelSink:
+    """Streaming Excel writer using openpyxl's write-only mode."""
+
+    def __init__(self, path, sheet="Scores", columns=None):
+        from openpyxl import Workbook  # Only needed for Excel output
+
+        self._path = path
+        self._workbook = Workbook(write_only=True)
+        self._sheet = self._workbook.create_sheet(sheet)
+        self._columns = columns
+        self._started = False
+
+    def write(self, row):
+        if not self._started:
+            self._columns = dict.fromkeys(self._columns or row)
+            self._sheet.append(list(self._columns))
+            self._started = True
+        _check_columns(row, self._columns)
+        self._sheet.append([row.get(column) for column in self._columns])
+
+    def close(self):
+        self._workbook.save(self._path)
+
+
+def open_sink(path, sheet="Scores", columns=None):
+    """
+    Return a row writer for ``path``: Excel (one ``sheet``) for ``.xlsx``, CSV otherwise.
+    Args:
+        path (str): Output file.
+        sheet (str): Worksheet name of Excel output.
+        columns (tuple): Fixed header; defaults to the keys of the first row.
+            Either way, a row with a column outside the header raises ValueError.
+    Returns:
+        object: A writer with ``write(row)`` and ``close()``.
+    """
+    if os.path.splitext(path)[1].lower() == ".xlsx":
+        return _ExcelSink(path, sheet, columns)
+    return _CsvSink(path, columns)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score Data Maturity Assessment submissions in bulk.")
+    parser.add_argument("input", help="CSV or JSONL file with one submission per row")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .xlsx)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Submissions per worker task (default: 1000)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    sink = open_sink(args.output)
+    start = time.perf_counter()
+    count = 0
+    try:
+        for rows in score_file(args.input, args.chunk_size, args.workers):
+            for row in rows:
+                sink.write(row)
+            count += len(rows)
+            elapsed = time.perf_counter() - start
+            print(f"\rScored {count} submissions ({count / elapsed:,.0f} rows/s)", end="", file=sys.stderr)
+    except ValueError as error:
+        print(f"\nError: {error}", file=sys.stderr)
+        return 1
+    finally:
+        sink.close()
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"\rScored {count} submissions in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,370 @@
+"""Headless rerun benchmark for every page of the assessment flow.
+
+Drives virtual_narrative.py through Streamlit's AppTest harness from the landing
+page to the PDF download button, and records for each rerun its wall time, the peak
+memory allocated while it ran, the number of elements it emitted and the bytes
+of element payload sent to the browser (the serialized protos). Results can be
+saved as a baseline JSON file and later runs compared against it.
+
+Question navigation runs inside ``st.fragment``s. AppTest always reruns the
+whole script, so clicks inside a fragment are replayed as fragment-scoped
+reruns, as a browser sends them. ``--clicks`` times every such click both ways
+and reports the per-click latency saved by the fragments.
+
+Usage:
+    python bench_reruns.py --repeat 5 --save-baseline bench_baseline.json
+    python bench_reruns.py --repeat 5 --compare bench_baseline.json --threshold 0.25
+    python bench_reruns.py --clicks --repeat 5
+"""
+import contextlib  # For the timed runner patch
+import dataclasses  # For fragment-scoped rerun requests
+import argparse  # For the command-line interface
+import json  # For baseline files
+import os  # For paths and environment
+import platform  # For run metadata
+import statistics  # For medians across repeats
+import sys  # For the exit status
+import tempfile  # For isolated response and session stores
+import time  # For wall time
+import tracemalloc  # For peak memory per rerun
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(BASE_DIR, "virtual_narrative.py")
+
+# Rerun scopes: the whole script, or only the fragment the clicked widget is in
+APP, FRAGMENT = "app", "fragment"
+
+_script_cache = None  # Compiled script shared by every timed run
+
+
+@contextlib.contextmanager
+def timed_runner(at, scope=APP):
+    """
+    Time the next ``at.run()`` on the script thread, from the start of the run
+    to the runner's shutdown (so follow-up reruns the click requested count),
+    leaving out the harness's polling. The compiled script is cached across
+    runs, as a server's ScriptCache does (AppTest recompiles on every run). With ``scope=FRAGMENT`` the run reruns
+    only the most recently registered fragment, like a click on a widget
+    inside an ``st.fragment`` in the browser; its element tree then holds only
+    the fragment's elements.
+    Yields:
+        dict: Filled with ``script_ms`` once the run has finished.
+    """
+    from streamlit.runtime.scriptrunner import ScriptRunnerEvent
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.scriptrunner_utils.script_requests import ScriptRequests
+    from streamlit.testing.v1 import app_test
+
+    global _script_cache
+    if _script_cache is None:
+        _script_cache = ScriptCache()
+    timing = {}
+    fragment_id = None
+    if scope == FRAGMENT:
+        registered = at._fragment_storage._registration_sequence_by_id
+        fragment_id = max(registered, key=registered.get)
+    base = app_test.LocalScriptRunner
+
+    class TimedScriptRunner(base):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self._script_cache = _script_cache
+            if fragment_id is not None:
+                self._requests = ScriptRequests()  # Drop the implicit full-app initial rerun
+            self.on_event.connect(self._time_event, weak=False)
+
+        def _time_event(self, sender, event, **kwargs):
+            if event == ScriptRunnerEvent.SCRIPT_STARTED:
+                timing.setdefault("started", time.perf_counter())
+            elif event == ScriptRunnerEvent.SHUTDOWN and "started" in timing:
+                timing["script_ms"] = (time.perf_counter() - timing.pop("started")) * 1000
+
+        def request_rerun(self, rerun_data):
+            if fragment_id is not None:
+                rerun_data = dataclasses.replace(rerun_data, fragment_id_queue=[fragment_id], is_fragment_scoped_rerun=True)
+            return super().request_rerun(rerun_data)
+
+    app_test.LocalScriptRunner = TimedScriptRunner
+    try:
+        yield timing
+    finally:
+        app_test.LocalScriptRunner = base
+
+
+def _button(at, *labels, prefix=None):
+    """Return the last button whose label matches (the current question's, on pages that show two)."""
+    matches = [button for button in at.button if button.label in labels or (prefix and button.label.startswith(prefix))]
+    if not matches:
+        raise LookupError(f"No button labelled {labels or prefix!r} on this page")
+    return matches[-1]
+
+
+def _await_report(at, timeout=60):
+    """
+    Wait for the results page's background PDF render, so the next rerun shows
+    the download button. The button itself (``on_click="ignore"``) never
+    reruns the script, so there is no click to time.
+    """
+    from report import get_pdf_report
+
+    snapshot = at.session_state["result_snapshot"]
+    get_pdf_report(*snapshot.report_arguments(), fingerprint=snapshot.fingerprint, timeout=timeout)
+
+
+def assessment_steps(answer=lambda key: 2, first_name="Bench"):
+    """
+    Describe one respondent's path through the app as a list of reruns.
+    Args:
+        answer (callable): Returns the option index to select for a question key.
+        first_name (str): First name entered on the user info page.
+    Returns:
+        list: (page, step, scope, action) tuples; ``action(at)`` prepares the
+        AppTest for the rerun, which the caller then runs; ``scope`` is APP or
+        FRAGMENT for clicks inside a question fragment.
+    """
+    from questionnaire import SECTIONS, WEIGHTING_QUESTIONS
+
+    def fill_user_info(at):
+        at.text_input(key="user_first_name_input").input(first_name)
+        at.text_input(key="user_last_name_input").input("Respondent")
+        at.text_input(key="user_email_input").input("bench@example.com")
+        at.text_input(key="user_org_name_input").input("Benchmark Org")
+        at.text_input(key="user_business_unit_input").input("Data")
+        _button(at, "Start Assessment").click()
+
+    def answer_question(key, *labels, prefix=None):
+        def action(at):
+            at.radio(key=key).set_value(answer(key))
+            _button(at, *labels, prefix=prefix).click()
+        return action
+
+    steps = [
+        ("landing", "landing", APP, lambda at: None),
+        ("privacy", "privacy", APP, lambda at: at.button(key="start_button").click()),
+        ("user_info", "user_info", APP, lambda at: _button(at, "Continue").click()),
+        ("weighting", "weighting_start", APP, fill_user_info),
+    ]
+    for i, question in enumerate(WEIGHTING_QUESTIONS):
+        steps.append(("weighting", f"weighting_{question.key}", FRAGMENT, answer_question(question.key, "Next ➡️", "Submit")))
+    for section in SECTIONS:
+        for question in section.questions:
+            steps.append((f"section_{section.key}", f"{section.key}_{question.key}", FRAGMENT, answer_question(question.key, "Next ➡️", prefix="Submit ")))
+    steps.append(("results", "results_rerun", APP, lambda at: None))
+    steps.append(("pdf", "pdf_download", APP, _await_report))
+    return steps
+
+
+def count_elements(node):
+    """Count the elements below a node of the AppTest element tree."""
+    children = getattr(node, "children", None) or {}
+    return sum(1 + count_elements(child) for child in children.values())
+
+
+def payload_bytes(node):
+    """Sum the serialized size of the element protos below a node, i.e. the bytes sent per rerun."""
+    total = 0
+    for child in (getattr(node, "children", None) or {}).values():
+        proto = getattr(child, "proto", None)
+        if proto is not None:
+            total += proto.ByteSize()
+        total += payload_bytes(child)
+    return total
+
+
+def run_flow(measure_memory=False, timeout=60, fragments=True):
+    """
+    Run one respondent through the app.
+    Args:
+        measure_memory (bool): Trace allocations to record peak memory per rerun.
+        timeout (float): AppTest timeout per rerun, in seconds.
+        fragments (bool): Replay clicks inside question fragments as
+            fragment-scoped reruns; if False every click reruns the whole script.
+    Returns:
+        list: One dict per step with its page, rerun scope, wall time (as
+        seen by the caller), script time (on the script thread), peak memory,
+        element count and payload bytes.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(SCRIPT_PATH, default_timeout=timeout)
+    results = []
+    if measure_memory:
+        tracemalloc.start()
+    try:
+        for page, step, scope, action in assessment_steps():
+            scope = scope if fragments else APP
+            action(at)
+            if measure_memory:
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+            with timed_runner(at, scope) as timing:
+                start = time.perf_counter()
+                at.run()
+                wall = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(f"Step {step} raised: {at.exception[0].message}")
+            if page == "pdf" and not at.get("download_button"):
+                raise LookupError("No download button on the results page once the report was ready")
+            result = {"page": page, "step": step, "scope": scope, "wall_ms": wall * 1000, "script_ms": timing["script_ms"], "elements": count_elements(at._tree), "payload_bytes": payload_bytes(at._tree)}
+            if measure_memory:
+                result["peak_kib"] = (tracemalloc.get_traced_memory()[1] - baseline) / 1024
+            results.append(result)
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    return results
+
+
+def benchmark(repeat=3):
+    """
+    Benchmark the flow: median wall time over ``repeat`` runs plus one traced run.
+    Returns:
+        dict: Run metadata and per-step measurements.
+    """
+    runs = [run_flow() for _ in range(repeat)]
+    traced = run_flow(measure_memory=True)
+    steps = {}
+    for i, first in enumerate(runs[0]):
+        steps[first["step"]] = {
+            "page": first["page"],
+            "scope": first["scope"],
+            "wall_ms": round(statistics.median(run[i]["wall_ms"] for run in runs), 3),
+            "script_ms": round(statistics.median(run[i]["script_ms"] for run in runs), 3),
+            "peak_kib": round(traced[i]["peak_kib"], 1),
+            "elements": first["elements"],
+            "payload_bytes": first["payload_bytes"],
+        }
+    import streamlit
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "steps": steps,
+    }
+
+
+def click_latency(repeat=3):
+    """
+    Time every click inside a question fragment as a whole-script rerun and as
+    a fragment-scoped rerun, on the script thread.
+    Args:
+        repeat (int): Runs per mode; the median is kept.
+    Returns:
+        dict: Step name to app and fragment wall time (ms) and payload bytes.
+    """
+    app_runs = [run_flow(fragments=False) for _ in range(repeat)]
+    fragment_runs = [run_flow(fragments=True) for _ in range(repeat)]
+    clicks = {}
+    for i, step in enumerate(fragment_runs[0]):
+        if step["scope"] != FRAGMENT:
+            continue
+        clicks[step["step"]] = {
+            "app_ms": round(statistics.median(run[i]["script_ms"] for run in app_runs), 3),
+            "fragment_ms": round(statistics.median(run[i]["script_ms"] for run in fragment_runs), 3),
+            "app_bytes": app_runs[0][i]["payload_bytes"],
+            "fragment_bytes": step["payload_bytes"],
+        }
+    return clicks
+
+
+def format_clicks(clicks):
+    """Render per-click latency of whole-script against fragment-scoped reruns."""
+    lines = [f"{'click':<34}{'app ms':>10}{'fragment ms':>13}{'saved':>9}{'app B':>9}{'fragment B':>12}"]
+    for step, click in clicks.items():
+        saved = 1 - click["fragment_ms"] / click["app_ms"] if click["app_ms"] else 0.0
+        lines.append(f"{step:<34}{click['app_ms']:>10.1f}{click['fragment_ms']:>13.1f}{saved:>9.0%}{click['app_bytes']:>9}{click['fragment_bytes']:>12}")
+    app_total = sum(click["app_ms"] for click in clicks.values())
+    fragment_total = sum(click["fragment_ms"] for click in clicks.values())
+    lines.append(f"{'median per click':<34}{statistics.median(c['app_ms'] for c in clicks.values()):>10.1f}{statistics.median(c['fragment_ms'] for c in clicks.values()):>13.1f}")
+    lines.append(f"{'total':<34}{app_total:>10.1f}{fragment_total:>13.1f}{1 - fragment_total / app_total:>9.0%}")
+    return "\n".join(lines)
+
+
+def compare(current, baseline, threshold=0.25, min_ms=5.0):
+    """
+    Compare a benchmark against a baseline.
+    Args:
+        current (dict): Result of benchmark().
+        baseline (dict): A previously saved result.
+        threshold (float): Allowed relative increase of wall time, peak memory
+            and payload bytes.
+        min_ms (float): Wall time increases below this are treated as noise.
+    Returns:
+        list: Human-readable regression messages; empty if none.
+    """
+    regressions = []
+    for step, now in current["steps"].items():
+        before = baseline["steps"].get(step)
+        if before is None:
+            continue
+        if now["wall_ms"] > before["wall_ms"] * (1 + threshold) and now["wall_ms"] - before["wall_ms"] > min_ms:
+            regressions.append(f"{step}: wall {before['wall_ms']:.1f} -> {now['wall_ms']:.1f} ms")
+        if now["peak_kib"] > before["peak_kib"] * (1 + threshold) and now["peak_kib"] - before["peak_kib"] > 64:
+            regressions.append(f"{step}: peak {before['peak_kib']:.0f} -> {now['peak_kib']:.0f} KiB")
+        if now["payload_bytes"] > before.get("payload_bytes", now["payload_bytes"]) * (1 + threshold):
+            regressions.append(f"{step}: payload {before['payload_bytes']} -> {now['payload_bytes']} bytes")
+    return regressions
+
+
+def format_table(result, baseline=None):
+    """Render per-step measurements, with the change against a baseline if given."""
+    lines = [f"{'step':<34}{'wall ms':>10}{'script ms':>11}{'peak KiB':>10}{'elements':>10}{'payload B':>11}" + ("   vs baseline" if baseline else "")]
+    for step, now in result["steps"].items():
+        line = f"{step:<34}{now['wall_ms']:>10.1f}{now.get('script_ms', 0.0):>11.1f}{now['peak_kib']:>10.0f}{now['elements']:>10}{now['payload_bytes']:>11}"
+        before = baseline["steps"].get(step) if baseline else None
+        if before:
+            line += f"   {(now['wall_ms'] / before['wall_ms'] - 1) * 100:+6.1f}%"
+        lines.append(line)
+    total = sum(step["wall_ms"] for step in result["steps"].values())
+    payload = sum(step["payload_bytes"] for step in result["steps"].values())
+    script = sum(step.get("script_ms", 0.0) for step in result["steps"].values())
+    lines.append(f"{'total':<34}{total:>10.1f}{script:>11.1f}{'':>20}{payload:>11}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every rerun of the assessment flow headlessly.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per step; the median is kept (default: 3)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results to a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (default: 0.25)")
+    parser.add_argument("--output", metavar="PATH", help="Also write the results JSON here")
+    parser.add_argument("--clicks", action="store_true", help="Compare per-click latency of whole-script and fragment reruns")
+    args = parser.parse_args(argv)
+
+    # Keep benchmark submissions and spilled sessions out of the real stores
+    scratch = tempfile.mkdtemp(prefix="vn-bench-")
+    os.environ.setdefault("VN_RESPONSE_DB", os.path.join(scratch, "responses.db"))
+    os.environ.setdefault("VN_SESSION_DB", os.path.join(scratch, "sessions.db"))
+    sys.path.insert(0, BASE_DIR)
+
+    if args.clicks:
+        print(format_clicks(click_latency(args.repeat)))
+        return 0
+
+    result = benchmark(args.repeat)
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+    print(format_table(result, baseline))
+
+    for path in filter(None, (args.save_baseline, args.output)):
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(result, file, indent=2)
+
+    if baseline:
+        regressions = compare(result, baseline, args.threshold)
+        for message in regressions:
+            print(f"REGRESSION {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
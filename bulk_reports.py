@@ -0,0 +1,195 @@
+"""Bulk rendering of personalized PDF reports for a cohort.
+
+Takes the same CSV or JSONL submissions file as batch_score.py and renders one
+generate_pdf_report document per submission across a process pool. Each worker
+loads the report font and logo once, when it starts. Optional respondent
+columns (``first_name``, ``last_name``, ``org_name``, ``business_unit``) and an
+``id`` column personalize the report and its file name.
+
+Usage:
+    python bulk_reports.py submissions.csv -o reports/        # one PDF per submission
+    python bulk_reports.py submissions.csv -o reports.zip     # a single zip archive
+"""
+import argparse  # For the command-line interface
+import os  # For CPU count and output paths
+import re  # For safe file names
+import statistics  # For the timing summary
+import sys  # For progress reporting on stderr
+import time  # For per-report timing
+import zipfile  # For zip output
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+import report
+from batch_score import chunked, iter_submissions, parse_submissions
+from confidence import score_band
+from insights import analytics_capabilities, dynamic_recommendations, insight_engine
+from scoring import MATURITY_LEVELS, MATURITY_RECOMMENDATIONS, SECTION_TITLES, score_assessment
+
+
+def report_arguments(scores, n, bands, band=None):
+    """
+    Build the generate_pdf_report arguments for one scored submission.
+    Args:
+        scores (scoring.Scores): Scores of a stack of submissions.
+        n (int): Position of the submission in the stack.
+        bands (np.ndarray): insight_engine.bands() of the stack.
+        band (confidence.ScoreBand): The submission's confidence band.
+    Returns:
+        tuple: Positional arguments for report.generate_pdf_report.
+    """
+    level = MATURITY_LEVELS[int(scores.level[n])]
+    return (
+        level,
+        float(scores.overall[n]),
+        MATURITY_RECOMMENDATIONS[level.index],
+        dict(zip(SECTION_TITLES, scores.weighted_scores[n].tolist())),
+        insight_engine.insights(bands[n]),
+        analytics_capabilities[level.label],
+        dynamic_recommendations[level.label],
+        {k: v for k, v in analytics_capabilities.items() if k != level.label},
+        band,
+    )
+
+
+def prepared_for(row):
+    """Return the respondent line for a submission, or None if it is anonymous."""
+    name = " ".join(part for part in (row.get("first_name"), row.get("last_name")) if part)
+    organization = " - ".join(part for part in (row.get("org_name"), row.get("business_unit")) if part)
+    return ", ".join(part for part in (name, organization) if part) or None
+
+
+def report_filename(row, line):
+    """Return a unique, filesystem-safe file name for a submission's report."""
+    label = row.get("id") or " ".join(part for part in (row.get("first_name"), row.get("last_name")) if part)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", str(label or "")).strip("_")[:60]
+    return f"{line:05d}_{slug}.pdf" if slug else f"{line:05d}.pdf"
+
+
+def render_chunk(rows, first_line=1):
+    """
+    Score and render a chunk of submissions; runs in a worker process.
+    Personalized reports bypass report_cache, which only holds anonymous ones.
+    Args:
+        rows (list): Submissions as dicts.
+        first_line (int): Position of the first row in the input.
+    Returns:
+        list: (file name, PDF bytes, render seconds) per submission.
+    """
+    answers, weights, priorities = parse_submissions(rows, first_line, with_priorities=True)
+    scores = score_assessment(answers, weights)
+    bands = insight_engine.bands(scores.section_scores, answers)
+    rendered = []
+    for n, row in enumerate(rows):
+        start = time.perf_counter()
+        if np.isnan(priorities[n]).any():  # Default weights: only the answers are perturbed
+            band = score_band(answers[n], weights=weights[n])
+        else:
+            band = score_band(answers[n], priorities[n])
+        pdf_bytes = report.generate_pdf_report(*report_arguments(scores, n, bands, band), prepared_for=prepared_for(row))
+        rendered.append((report_filename(row, first_line + n), pdf_bytes, time.perf_counter() - start))
+    return rendered
+
+
+def render_file(path, chunk_size=8, workers=None):
+    """
+    Render the reports of a submissions file across a process pool.
+    Args:
+        path (str): CSV or JSONL submissions file.
+        chunk_size (int): Submissions per task sent to a worker.
+        workers (int): Worker processes; defaults to the CPU count.
+    Yields:
+        tuple: (file name, PDF bytes, render seconds), in completion order.
+    """
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=report.warm_up) as executor:
+        pending = set()
+        first_line = 1
+        for chunk in chunked(iter_submissions(path), chunk_size):
+            pending.add(executor.submit(render_chunk, chunk, first_line))
+            first_line += len(chunk)
+            # Keep a couple of chunks per worker in flight so memory stays bounded
+            while len(pending) >= 2 * workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        for future in pending:
+            yield from future.result()
+
+
+class _DirectorySink:
+    """Writes each report to its own file in a directory."""
+
+    def __init__(self, path):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+
+    def write(self, name, pdf_bytes):
+        with open(os.path.join(self._path, name), "wb") as file:
+            file.write(pdf_bytes)
+
+    def close(self):
+        pass
+
+
+class _ZipSink:
+    """Appends each report to a single zip archive."""
+
+    def __init__(self, path):
+        self._archive = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def write(self, name, pdf_bytes):
+        self._archive.writestr(name, pdf_bytes)
+
+    def close(self):
+        self._archive.close()
+
+
+def timing_summary(durations, elapsed):
+    """
+    Summarize per-report render times.
+    Args:
+        durations (list): Render seconds per report.
+        elapsed (float): Wall-clock seconds for the whole run.
+    Returns:
+        str: Human-readable summary.
+    """
+    if not durations:
+        return "No reports rendered."
+    ordered = sorted(durations)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return (
+        f"Rendered {len(durations)} reports in {elapsed:.2f}s ({len(durations) / elapsed:,.1f} reports/s)\n"
+        f"Per report: min {ordered[0] * 1000:.0f} ms, mean {statistics.fmean(ordered) * 1000:.0f} ms, "
+        f"p50 {statistics.median(ordered) * 1000:.0f} ms, p95 {p95 * 1000:.0f} ms, max {ordered[-1] * 1000:.0f} ms"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render personalized Data Maturity Assessment reports in bulk.")
+    parser.add_argument("input", help="CSV or JSONL file with one submission per row")
+    parser.add_argument("-o", "--output", required=True, help="Output directory, or a .zip file")
+    parser.add_argument("--chunk-size", type=int, default=8, help="Submissions per worker task (default: 8)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    sink = _ZipSink(args.output) if args.output.lower().endswith(".zip") else _DirectorySink(args.output)
+    durations = []
+    start = time.perf_counter()
+    try:
+        for name, pdf_bytes, seconds in render_file(args.input, args.chunk_size, args.workers):
+            sink.write(name, pdf_bytes)
+            durations.append(seconds)
+            print(f"\rRendered {len(durations)} reports", end="", file=sys.stderr)
+    except (ValueError, FileNotFoundError) as error:
+        print(f"\nError: {error}", file=sys.stderr)
+        return 1
+    finally:
+        sink.close()
+    print("\r" + timing_summary(durations, time.perf_counter() - start), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
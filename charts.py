@@ -0,0 +1,62 @@
+"""Maturity score gauge, shared by the results page and the PDF report.
+
+Plotly gauge figures are memoized per rounded score and size, so results-page
+reruns reuse the same figure instead of rebuilding and revalidating it. The
+cached figures are shared between sessions and must not be modified.
+"""
+from functools import lru_cache
+
+from scoring import MATURITY_LEVELS, MATURITY_THRESHOLDS
+
+GAUGE_MAX = 5
+
+# Coloured bands of the gauge: (start, end, RGB), one per maturity level
+_BOUNDS = (0,) + tuple(MATURITY_THRESHOLDS.tolist()) + (GAUGE_MAX,)
+GAUGE_BANDS = tuple((start, end, level.colour) for start, end, level in zip(_BOUNDS, _BOUNDS[1:], MATURITY_LEVELS))
+
+
+@lru_cache(maxsize=256)
+def _gauge_figure(score, width, height):
+    import plotly.graph_objects as go  # Imported on first use; only the results page needs it
+
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=score,
+        title={'text': "Your Data Maturity Score", 'font': {'size': 24}},
+        gauge={
+            'axis': {'range': [None, GAUGE_MAX]},
+            'bar': {'color': "orange"},
+            'steps': [{'range': [start, end], 'color': "rgb(%d, %d, %d)" % rgb} for start, end, rgb in GAUGE_BANDS],
+            'threshold': {
+                'line': {'color': "black", 'width': 4},
+                'thickness': 0.75,
+                'value': score
+            }
+        }
+    ))
+    fig.update_layout(width=width, height=height)
+    return fig
+
+
+def create_gauge_chart(score, width=500, height=300):
+    """
+    Create a gauge chart for the data maturity score.
+    Args:
+        score (float): The data maturity score (between 1 and 5).
+        width (int): Width of the chart.
+        height (int): Height of the chart.
+    Returns:
+        plotly.graph_objects.Figure: The gauge chart figure, shared through the
+        cache; do not modify it.
+    """
+    return _gauge_figure(round(float(score), 2), int(width), int(height))
+
+
+def gauge_cache_stats():
+    """
+    Report gauge figure cache usage.
+    Returns:
+        dict: Hits, misses, current size and maximum size.
+    """
+    info = _gauge_figure.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize, "max_entries": info.maxsize}
@@ -0,0 +1,206 @@
+"""Running cohort aggregates for the live benchmark dashboard.
+
+Every completed assessment adds its scores to a set of running aggregates:
+counts, sums and sums of squares of the section and overall scores, and
+histograms over the five maturity levels, for the whole cohort and for each
+organization and business unit. The aggregates are updated by the response
+store's writer thread inside the transaction that stores the submissions and
+persisted next to them, so reading the dashboard costs the same however many
+responses have been collected; the submissions are only scanned once, to
+rebuild the aggregates when they are missing or out of step.
+"""
+import json  # For persisting aggregates
+import sqlite3  # For a store without the aggregates table yet
+
+import numpy as np
+
+from questionnaire import SECTIONS
+from scoring import MATURITY_LEVELS, MATURITY_STAGES, SECTION_TITLES, maturity_level_index
+from stored_aggregate import StoredAggregate
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cohort_aggregates (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    PRIMARY KEY (kind, name)
+)
+"""
+
+# Ways the cohort is split: the whole cohort, then one group per respondent field value
+ALL, ORG, BUSINESS_UNIT = "all", "org_name", "business_unit"
+SPLITS = (ORG, BUSINESS_UNIT)
+NOT_GIVEN = "(not given)"
+
+
+def group_name(value):
+    """Normalize an organization or business unit name into a group name."""
+    return " ".join(str(value or "").split()) or NOT_GIVEN
+
+
+class CohortStats:
+    """Running sums and histograms of one group of respondents."""
+
+    def __init__(self):
+        sections, levels = len(SECTIONS), len(MATURITY_LEVELS)
+        self.count = 0
+        self.section_sum = np.zeros(sections)
+        self.section_sumsq = np.zeros(sections)
+        self.overall_sum = 0.0
+        self.overall_sumsq = 0.0
+        self.level_counts = np.zeros(levels, dtype=np.int64)
+        self.section_level_counts = np.zeros((sections, levels), dtype=np.int64)
+
+    def add(self, section_scores, overall, levels):
+        """
+        Add respondents to the group.
+        Args:
+            section_scores (np.ndarray): (n, sections) section scores.
+            overall (np.ndarray): (n,) weighted average scores.
+            levels (np.ndarray): (n,) maturity level indices of the overall scores.
+        """
+        self.count += len(overall)
+        self.section_sum += section_scores.sum(axis=0)
+        self.section_sumsq += (section_scores ** 2).sum(axis=0)
+        self.overall_sum += float(overall.sum())
+        self.overall_sumsq += float((overall ** 2).sum())
+        self.level_counts += np.bincount(levels, minlength=len(MATURITY_LEVELS))
+        section_levels = maturity_level_index(section_scores)  # (n, sections)
+        for row in range(len(SECTIONS)):
+            self.section_level_counts[row] += np.bincount(section_levels[:, row], minlength=len(MATURITY_LEVELS))
+
+    def summary(self):
+        """
+        Summarize the group.
+        Returns:
+            dict: Respondent count, mean and standard deviation of the overall
+            and section scores, and respondents per maturity level, overall
+            and per section.
+        """
+        n = self.count or 1
+        overall_mean = self.overall_sum / n
+        section_mean = self.section_sum / n
+        return {
+            "respondents": self.count,
+            "overall_mean": overall_mean,
+            "overall_std": max(self.overall_sumsq / n - overall_mean ** 2, 0.0) ** 0.5,
+            "section_mean": dict(zip(SECTION_TITLES, section_mean.tolist())),
+            "section_std": dict(zip(SECTION_TITLES, np.sqrt(np.maximum(self.section_sumsq / n - section_mean ** 2, 0.0)).tolist())),
+            "levels": dict(zip(MATURITY_STAGES, self.level_counts.tolist())),
+            "section_levels": {title: dict(zip(MATURITY_STAGES, counts)) for title, counts in zip(SECTION_TITLES, self.section_level_counts.tolist())},
+        }
+
+    def to_json(self):
+        """Serialize the running sums."""
+        return json.dumps({
+            "count": self.count,
+            "section_sum": self.section_sum.tolist(),
+            "section_sumsq": self.section_sumsq.tolist(),
+            "overall_sum": self.overall_sum,
+            "overall_sumsq": self.overall_sumsq,
+            "level_counts": self.level_counts.tolist(),
+            "section_level_counts": self.section_level_counts.tolist(),
+        }, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, text):
+        """Restore running sums saved with to_json."""
+        data = json.loads(text)
+        stats = cls()
+        stats.count = data["count"]
+        stats.section_sum = np.array(data["section_sum"], dtype=np.float64)
+        stats.section_sumsq = np.array(data["section_sumsq"], dtype=np.float64)
+        stats.overall_sum = data["overall_sum"]
+        stats.overall_sumsq = data["overall_sumsq"]
+        stats.level_counts = np.array(data["level_counts"], dtype=np.int64)
+        stats.section_level_counts = np.array(data["section_level_counts"], dtype=np.int64)
+        return stats
+
+
+class CohortAggregates(StoredAggregate):
+    """
+    Cohort statistics for everyone and per organization and business unit.
+    Args:
+        path (str): Database file shared with the response store.
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self._groups = {}  # (kind, name) -> CohortStats
+
+    def _group(self, kind, name):
+        key = (kind, name)
+        if key not in self._groups:
+            self._groups[key] = CohortStats()
+        return self._groups[key]
+
+    def _reset(self):
+        self._groups = {}
+
+    def _read(self, connection):
+        try:
+            rows = connection.execute("SELECT kind, name, stats FROM cohort_aggregates").fetchall()
+        except sqlite3.OperationalError:
+            rows = []  # No aggregates table yet
+        self._groups = {(kind, name): CohortStats.from_json(stats) for kind, name, stats in rows}
+
+    def _count(self):
+        return self._groups[(ALL, "")].count if (ALL, "") in self._groups else 0
+
+    def _add(self, records, scores):
+        """Add scored records to every group they belong to; returns the touched group keys."""
+        touched = {(ALL, "")}
+        self._group(ALL, "").add(scores.section_scores, scores.overall, scores.level)
+        for kind in SPLITS:
+            rows_by_name = {}
+            for i, record in enumerate(records):
+                rows_by_name.setdefault(group_name(record.get(kind)), []).append(i)
+            for name, rows in rows_by_name.items():
+                self._group(kind, name).add(scores.section_scores[rows], scores.overall[rows], scores.level[rows])
+                touched.add((kind, name))
+        return touched
+
+    def _save(self, connection, keys):
+        connection.execute(SCHEMA)
+        connection.executemany(
+            "INSERT OR REPLACE INTO cohort_aggregates (kind, name, stats) VALUES (?, ?, ?)",
+            [(kind, name, self._groups[(kind, name)].to_json()) for kind, name in keys],
+        )
+
+    def _save_all(self, connection):
+        connection.execute(SCHEMA)
+        connection.execute("DELETE FROM cohort_aggregates")
+        self._save(connection, list(self._groups))
+
+    def summary(self, kind=ALL, name=""):
+        """
+        Summarize one group.
+        Args:
+            kind (str): ALL, ORG or BUSINESS_UNIT.
+            name (str): Group name; ignored for ALL.
+        Returns:
+            dict: See CohortStats.summary; an empty group has no respondents.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            stats = self._groups.get((kind, "" if kind == ALL else group_name(name)))
+            return (stats or CohortStats()).summary()
+
+    def split(self, kind):
+        """
+        Summarize every group of a split.
+        Args:
+            kind (str): ORG or BUSINESS_UNIT.
+        Returns:
+            dict: Group name to summary, largest groups first.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            groups = [(name, stats) for (group_kind, name), stats in self._groups.items() if group_kind == kind]
+            groups.sort(key=lambda item: -item[1].count)
+            return {name: stats.summary() for name, stats in groups}
+
+
+# ✅ Shared aggregates, kept current by the response store's writer
+cohort_aggregates = CohortAggregates()
+cohort_aggregates.attach()
@@ -0,0 +1,119 @@
+"""Monte Carlo confidence band on the weighted average maturity score.
+
+Every answer is a coarse choice on a 1-5 scale: a respondent picking "3" could
+as well have meant 2.6 or 3.4, and the six priorities that set the section
+weights are just as coarse. Near a band cut-off (1.5, 2.5, 3.5, 4.5) that
+matters: a 2.49 and a 2.51 get different advice.
+
+The simulation draws ``SAMPLES`` alternative assessments. Each answer score
+and each priority moves uniformly by up to ``JITTER`` (half a step), but never
+further than its distance to the nearer end of the scale: the draws stay on
+the scale and centred on the respondent's choices, so answers at 1 or 5 stay
+put. Section scores are linear in the answers, so each chunk of samples is
+scored with one small matrix product instead of building the perturbed answer
+matrices; the weights are renormalized as scoring.score_assessment does. The
+spread of the weighted average gives a confidence interval, which always
+contains the unperturbed score, and the share of samples landing in each band
+gives the probability of each maturity level. The draws come from a fixed
+seed, so the same answers always give the same band.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring import MATURITY_LEVELS, SECTION_MASK, maturity_level_index, score_assessment, weights_from_priorities
+
+SAMPLES = 100_000
+JITTER = 0.5  # Half a step of the 1-5 scale
+CONFIDENCE = 0.95
+SCALE = (1.0, 5.0)
+CHUNK = 8192  # Samples simulated at a time; small enough to stay in the CPU cache
+
+
+def _jitter_widths(values, jitter):
+    """Largest symmetric change of each value that keeps it on the scale."""
+    low, high = SCALE
+    return np.clip(np.minimum(values - low, high - values), 0.0, jitter)
+
+
+class ScoreBand(NamedTuple):
+    """Confidence interval of a weighted average score and level probabilities."""
+    low: float  # Lower bound of the interval
+    high: float  # Upper bound of the interval
+    confidence: float  # Probability the interval covers, e.g. 0.95
+    level_probabilities: tuple  # Probability of each of MATURITY_LEVELS
+
+    def likely_levels(self, threshold=0.01):
+        """
+        List the maturity levels the score may fall in.
+        Args:
+            threshold (float): Smallest probability listed.
+        Returns:
+            list: (scoring.MaturityLevel, probability) pairs, most likely first.
+        """
+        levels = [(level, probability) for level, probability in zip(MATURITY_LEVELS, self.level_probabilities) if probability >= threshold]
+        return sorted(levels, key=lambda pair: -pair[1])
+
+
+def score_band(answer_matrix, priorities=None, samples=SAMPLES, jitter=JITTER, confidence=CONFIDENCE, seed=0, weights=None):
+    """
+    Simulate how far coarse answers and priorities can move the weighted average score.
+    Args:
+        answer_matrix (array-like): (sections, questions) answer scores, zero-padded.
+        priorities (array-like): (sections,) priority scores of the weighting page.
+        samples (int): Number of simulated assessments.
+        jitter (float): Largest change of an answer or priority, in scale points.
+        confidence (float): Coverage of the reported interval.
+        seed (int): Seed of the draws.
+        weights (array-like): (sections,) fixed section weights, used instead
+            of ``priorities`` when the respondent stated none (e.g. the default
+            weights of batch submissions); they are not perturbed.
+    Returns:
+        ScoreBand: The interval and the probability of each maturity level.
+    """
+    rng = np.random.default_rng(seed)
+    answer_matrix = np.asarray(answer_matrix, dtype=np.float64)
+    answer_widths = np.where(SECTION_MASK, _jitter_widths(answer_matrix, jitter), 0.0)  # Padding slots never move
+    if priorities is None:
+        priorities = np.asarray(weights, dtype=np.float64)  # Renormalized like priorities, never moved
+        priority_widths = np.zeros_like(priorities)
+    else:
+        priorities = np.asarray(priorities, dtype=np.float64)
+        priority_widths = _jitter_widths(priorities, jitter)
+
+    # A perturbed answer is value - width + 2 * width * U(0, 1), so a section score (the
+    # mean of its answers) is base + U @ spread, with U the (questions,) uniform draws
+    sections, questions = SECTION_MASK.shape
+    question_counts = SECTION_MASK.sum(axis=-1)
+    base = (answer_matrix - answer_widths).sum(axis=-1) / question_counts
+    spread = np.zeros((sections * questions, sections))
+    spread[np.arange(sections * questions), np.repeat(np.arange(sections), questions)] = (2 * answer_widths / question_counts[:, None]).ravel()
+
+    ones = np.ones(sections)
+    overall = np.empty(samples)
+    for start in range(0, samples, CHUNK):
+        count = min(CHUNK, samples - start)
+        section_scores = rng.random((count, sections * questions)) @ spread
+        section_scores += base
+        if priority_widths.any():
+            sample_weights = rng.random((count, sections))
+            sample_weights *= 2 * priority_widths
+            sample_weights += priorities - priority_widths
+            section_scores *= sample_weights
+            overall[start:start + count] = (section_scores @ ones) / (sample_weights @ ones)  # Row sums; sum(axis=-1) is slow over so short an axis
+        else:
+            overall[start:start + count] = section_scores @ (priorities / priorities.sum())
+    levels = maturity_level_index(overall)
+
+    tail = (1 - confidence) / 2
+    interval_low, interval_high = np.quantile(overall, (tail, 1 - tail))
+    # Reweighting is not linear, so the samples need not be centred exactly on the
+    # point score; the interval is widened to it rather than shown beside it
+    point = float(score_assessment(answer_matrix, weights_from_priorities(priorities)).overall)
+    counts = np.bincount(levels, minlength=len(MATURITY_LEVELS))
+    return ScoreBand(
+        low=min(float(interval_low), point),
+        high=max(float(interval_high), point),
+        confidence=confidence,
+        level_probabilities=tuple((counts / samples).tolist()),
+    )
@@ -0,0 +1,170 @@
+"""Streaming export of the stored assessments to CSV or Excel.
+
+Every submission becomes one row: its id, submission time and respondent
+details, the 18 answer scores and 6 priority scores under their question keys
+(so an export can be fed straight back into batch_score.py), the section
+weights, and the scores, maturity level and insights computed by the app's
+scoring logic. Rows are read from the response store in chunks with
+``fetchmany`` and written as they are scored, to a CSV file or an openpyxl
+write-only workbook, so memory use does not grow with the number of
+respondents.
+
+Usage:
+    python export.py -o responses.xlsx
+"""
+import argparse  # For the command-line interface
+import datetime  # For readable submission times
+import json  # For stored answers and weights
+import os  # For temporary export files
+import sys  # For progress reporting on stderr
+import tempfile  # For exports built for the admin download button
+import time  # For throughput measurement
+
+from batch_score import (ANSWER_COLUMNS, PRIORITY_COLUMNS, SCORE_COLUMNS,
+                         open_sink, score_chunk)
+from questionnaire import WEIGHTING_QUESTIONS
+from response_store import USER_FIELDS, connect, response_store
+from scoring import SECTION_TITLES
+
+# Columns read from the store, in export order
+_SELECT = "SELECT id, submitted_at, " + ", ".join(USER_FIELDS) + ", answers, priorities, weights FROM submissions ORDER BY id"
+
+# Header of every export, whatever the first stored submission holds
+EXPORT_COLUMNS = (
+    ("id", "submitted_at", *USER_FIELDS, *ANSWER_COLUMNS, *PRIORITY_COLUMNS)
+    + tuple(f"{title} Weight" for title in SECTION_TITLES)
+    + SCORE_COLUMNS
+)
+
+
+def _export_row(row):
+    """Flatten one stored submission into an export row (before scoring)."""
+    submission_id, submitted_at, *user, answers, priorities, weights = row
+    priorities = json.loads(priorities) if priorities else None
+    weights = json.loads(weights)
+    return {
+        "id": submission_id,
+        "submitted_at": datetime.datetime.fromtimestamp(submitted_at, datetime.timezone.utc).isoformat(timespec="seconds"),
+        **dict(zip(USER_FIELDS, user)),
+        **json.loads(answers),
+        **{question.key: (priorities or {}).get(question.key) for question in WEIGHTING_QUESTIONS},
+        **{f"{title} Weight": weights.get(title) for title in SECTION_TITLES},
+    }
+
+
+def _score_rows(rows, first_line, skipped):
+    """Score stored rows one at a time, leaving out (and recording) the malformed ones."""
+    results = []
+    for offset, row in enumerate(rows):
+        try:
+            results.extend(score_chunk([_export_row(row)], first_line + offset))
+        except ValueError as error:
+            if skipped is None:
+                raise
+            skipped.append((row[0], str(error)))
+    return results
+
+
+def iter_export_chunks(path=None, chunk_size=1000, skipped=None):
+    """
+    Stream the stored submissions as scored export rows.
+    Args:
+        path (str): Database file; defaults to the response store's.
+        chunk_size (int): Submissions read and scored at a time.
+        skipped (list): If given, malformed submissions are left out of the
+            export and appended to it as (id, error message); otherwise the
+            first one raises ValueError.
+    Yields:
+        list: Export rows (dicts) of one chunk, in submission order.
+    """
+    connection = connect(path or response_store.path)
+    try:
+        cursor = connection.execute(_SELECT)
+        first_line = 1
+        while rows := cursor.fetchmany(chunk_size):
+            try:
+                yield score_chunk([_export_row(row) for row in rows], first_line)
+            except ValueError:
+                # Rescore the chunk row by row to find the bad submissions
+                yield _score_rows(rows, first_line, skipped)
+            first_line += len(rows)
+    finally:
+        connection.close()
+
+
+def write_export(output, path=None, chunk_size=1000, progress=None, skipped=None):
+    """
+    Export every stored submission to a file.
+    Args:
+        output (str): Destination; ``.xlsx`` writes a workbook, anything else CSV.
+        path (str): Database file; defaults to the response store's.
+        chunk_size (int): Submissions read and scored at a time.
+        progress (callable): Called with the running row count after each chunk.
+        skipped (list): Collects malformed submissions instead of failing;
+            see ``iter_export_chunks``.
+    Returns:
+        int: Number of submissions exported.
+    """
+    sink = open_sink(output, sheet="Responses", columns=EXPORT_COLUMNS)
+    count = 0
+    try:
+        for rows in iter_export_chunks(path, chunk_size, skipped):
+            for row in rows:
+                sink.write(row)
+            count += len(rows)
+            if progress is not None:
+                progress(count)
+    finally:
+        sink.close()
+    return count
+
+
+def export_file(extension, path=None, progress=None, skipped=None):
+    """
+    Export to a temporary file and return its contents, for the admin download
+    button. The rows are still written as they are scored, but the finished
+    file is held in memory: use ``write_export`` (or the command line) for
+    stores too large for that.
+    Args:
+        extension (str): ".csv" or ".xlsx".
+        path (str): Database file; defaults to the response store's.
+        progress (callable): Called with the running row count after each chunk.
+        skipped (list): Collects malformed submissions instead of failing.
+    Returns:
+        bytes: The finished export.
+    """
+    descriptor, output = tempfile.mkstemp(suffix=extension, prefix="vn-export-")
+    os.close(descriptor)
+    try:
+        write_export(output, path, progress=progress, skipped=skipped)
+        with open(output, "rb") as file:
+            return file.read()
+    finally:
+        os.unlink(output)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the stored Data Maturity Assessment responses.")
+    parser.add_argument("-o", "--output", required=True, help="Output file (.csv or .xlsx)")
+    parser.add_argument("--db", default=None, help="Response database (default: VN_RESPONSE_DB or responses.db)")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Submissions read and scored at a time (default: 1000)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def report(count):
+        print(f"\rExported {count} submissions ({count / (time.perf_counter() - start):,.0f} rows/s)", end="", file=sys.stderr)
+
+    try:
+        count = write_export(args.output, args.db, args.chunk_size, progress=report)
+    except ValueError as error:
+        print(f"\nError: {error}", file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - start
+    rate = count / elapsed if elapsed else 0.0
+    print(f"\rExported {count} submissions in {elapsed:.2f}s ({rate:,.0f} rows/s) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""AI-driven insights and maturity stage content for the Data Maturity Assessment.
+
+Shared by the Streamlit app and the offline batch tools, so every channel
+produces the same advice for the same scores. Insights come from declarative
+rules compiled into threshold tables by InsightEngine; rules can target a
+section score or a single question's answer.
+"""
+import bisect  # For resolving one respondent's rules
+from typing import NamedTuple
+
+import numpy as np
+
+from questionnaire import SECTIONS
+from scoring import SECTION_TITLES
+
+
+class Insight(NamedTuple):
+    """One piece of advice selected by an insight rule."""
+    target: str  # Section title or question key the rule looked at
+    title: str  # Heading of the advice, e.g. "Data Quality"
+    band: int  # Index of the band the score fell in
+    mark: str  # Emoji marker of the band
+    message: str
+
+    @property
+    def markdown(self):
+        """The insight as shown on the results page."""
+        return f"{self.mark} **{self.title}**: {self.message}"
+
+    @property
+    def text(self):
+        """The insight as plain text, for the PDF report."""
+        return f"{self.title}: {self.message}"
+
+
+class InsightRule(NamedTuple):
+    """
+    Advice chosen by where a score falls between thresholds: a score up to and
+    including ``thresholds[i]`` gets ``messages[i]``, a score above them all
+    gets the last message. A band whose message is None gives no insight.
+    """
+    target: str  # Section title (section score) or question key (answer score)
+    thresholds: tuple  # Ascending band upper bounds, one fewer than the messages
+    messages: tuple  # One per band; None for a band without advice
+    marks: tuple = ("🔴", "🟡", "🟢")  # Emoji marker per band
+    title: str = None  # Defaults to the section title, or the question key
+
+
+class InsightEngine:
+    """
+    Insight rules compiled into threshold and message tables. A single
+    respondent is resolved with bisect, a batch in one NumPy comparison.
+    Args:
+        rules (iterable): InsightRule objects, in display order.
+    Raises:
+        ValueError: If a rule targets an unknown section or question, or its
+            thresholds, messages and marks do not line up.
+    """
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        width = max((len(rule.thresholds) for rule in self.rules), default=0)
+        self._thresholds = np.full((len(self.rules), width), np.inf)
+        self._section_rules, self._question_rules = [], []
+        for i, rule in enumerate(self.rules):
+            if len(rule.messages) != len(rule.thresholds) + 1 or len(rule.marks) < len(rule.messages):
+                raise ValueError(f"Insight rule for {rule.target!r} needs one message and mark per band")
+            if list(rule.thresholds) != sorted(rule.thresholds):
+                raise ValueError(f"Insight rule for {rule.target!r} has thresholds out of order")
+            self._thresholds[i, :len(rule.thresholds)] = rule.thresholds
+            if rule.target in SECTION_TITLES:
+                self._section_rules.append((i, SECTION_TITLES.index(rule.target)))
+            elif rule.target in ANSWER_COLUMNS:
+                self._question_rules.append((i, ANSWER_COLUMNS.index(rule.target)))
+            else:
+                raise ValueError(f"Insight rule targets unknown section or question {rule.target!r}")
+
+    def _insight(self, i, band):
+        rule = self.rules[i]
+        return Insight(rule.target, rule.title or rule.target, band, rule.marks[band], rule.messages[band])
+
+    def evaluate(self, section_scores, answers=None):
+        """
+        Select the insights of one respondent.
+        Args:
+            section_scores (dict): Score per section title.
+            answers (dict): Answer score per question key; question rules are
+                skipped without it.
+        Returns:
+            list: Insight objects, in rule order.
+        """
+        insights = []
+        for rule_index, rule in enumerate(self.rules):
+            if rule.target in section_scores:
+                score = section_scores[rule.target]
+            elif answers is not None and rule.target in answers:
+                score = answers[rule.target]
+            else:
+                continue
+            band = bisect.bisect_left(rule.thresholds, score)
+            if rule.messages[band] is not None:
+                insights.append(self._insight(rule_index, band))
+        return insights
+
+    def bands(self, section_scores, answer_scores=None):
+        """
+        Resolve every rule for a batch of respondents at once.
+        Args:
+            section_scores (array-like): (n, sections) section scores.
+            answer_scores (array-like): (n, sections, questions) answer scores;
+                question rules are left unresolved (-1) without them.
+        Returns:
+            np.ndarray: (n, rules) band index of every rule, or -1.
+        """
+        section_scores = np.asarray(section_scores, dtype=np.float64)
+        values = np.full((len(section_scores), len(self.rules)), np.nan)
+        for i, column in self._section_rules:
+            values[:, i] = section_scores[:, column]
+        if answer_scores is not None:
+            flat = np.asarray(answer_scores, dtype=np.float64)[..., _ANSWER_ROWS, _ANSWER_COLUMNS_INDEX]
+            for i, column in self._question_rules:
+                values[:, i] = flat[:, column]
+        bands = (values[:, :, None] > self._thresholds[None, :, :]).sum(axis=-1)
+        return np.where(np.isnan(values), -1, bands)
+
+    def insights(self, bands):
+        """
+        Turn one row of bands() into Insight objects.
+        Args:
+            bands (array-like): (rules,) band indices, -1 for unresolved rules.
+        Returns:
+            list: Insight objects, in rule order.
+        """
+        return [self._insight(i, int(band)) for i, band in enumerate(bands) if band >= 0 and self.rules[i].messages[band] is not None]
+
+
+# Every section question, in the (section, question) order of the answer matrices
+ANSWER_COLUMNS = tuple(question.key for section in SECTIONS for question in section.questions)
+_ANSWER_ROWS = np.array([row for row, section in enumerate(SECTIONS) for _ in section.questions])
+_ANSWER_COLUMNS_INDEX = np.array([column for section in SECTIONS for column in range(len(section.questions))])
+
+def question_scores(answer_scores):
+    """
+    Map one respondent's answer score matrix to question keys.
+    Args:
+        answer_scores (np.ndarray): (sections, questions) answer scores.
+    Returns:
+        dict: Answer score per question key, as taken by generate_ai_insights.
+    """
+    flat = np.asarray(answer_scores, dtype=np.float64)[_ANSWER_ROWS, _ANSWER_COLUMNS_INDEX]
+    return dict(zip(ANSWER_COLUMNS, flat.tolist()))
+
+
+# ✅ Section insight rules: at most 2 needs attention, up to 3.5 is progressing, above is strong
+SECTION_INSIGHT_RULES = (
+    InsightRule("Data Governance", (2, 3.5), (
+        "Your organization lacks formal governance policies. Consider establishing a data governance framework with clear roles and responsibilities.",
+        "Your governance policies are in place but need better enforcement. Focus on consistent monitoring and accountability.",
+        "Your governance policies are well-established. Continue optimizing with automation and AI-driven insights.",
+    )),
+    InsightRule("Data Quality", (2, 3.5), (
+        "Data accuracy and completeness are major concerns. Implement automated validation and monitoring processes.",
+        "Your data quality processes are improving but need more automation. Consider AI-powered real-time monitoring.",
+        "Your data quality is excellent. Focus on maintaining consistency and exploring advanced analytics.",
+    )),
+    InsightRule("Metadata Management", (2, 3.5), (
+        "Metadata is poorly managed. Establish a centralized metadata repository and enforce standardized definitions.",
+        "Metadata management is improving but lacks automation. Consider AI-driven lineage tracking.",
+        "Metadata is well-managed. Continue leveraging AI for real-time anomaly detection.",
+    )),
+    InsightRule("Data Integration", (2, 3.5), (
+        "Data integration is manual and inconsistent. Invest in automated API-based data flows.",
+        "Integration processes are improving but need more automation. Consider real-time synchronization.",
+        "Data integration is seamless. Explore AI-driven multi-cloud integration.",
+    )),
+    InsightRule("Data Analytics & AI", (2, 3.5), (
+        "Analytics adoption is low. Start with basic reporting and explore predictive analytics.",
+        "Analytics adoption is growing. Focus on embedding machine learning models into core processes.",
+        "Analytics adoption is excellent. Continue leveraging AI for decision intelligence.",
+    )),
+    InsightRule("Data Security & Privacy", (2, 3.5), (
+        "Security measures are weak. Implement role-based access control and encryption.",
+        "Security measures are improving but need better enforcement. Consider continuous compliance monitoring.",
+        "Security measures are robust. Focus on AI-driven anomaly detection and zero-trust models.",
+    )),
+)
+
+# ✅ Question insight rules: advice on a single answer, shown after the section insights.
+# They flag the lowest answer (1) to a question a section average can hide, and stay silent otherwise.
+QUESTION_INSIGHT_RULES = (
+    InsightRule("gov_q1", (1,), (
+        "No formal data governance policy exists. Write one that names data owners and sets the rules for sensitive data before scaling up analytics.",
+        None,
+    ), marks=("🔴", ""), title="Governance Policy"),
+    InsightRule("sp1", (1,), (
+        "Access to sensitive data is not controlled. Put role-based access control in place before sharing data more widely.",
+        None,
+    ), marks=("🔴", ""), title="Access Control"),
+    InsightRule("sp3", (1,), (
+        "Data is stored without encryption. Encrypt sensitive data at rest and in transit.",
+        None,
+    ), marks=("🔴", ""), title="Encryption"),
+)
+
+insight_engine = InsightEngine(SECTION_INSIGHT_RULES + QUESTION_INSIGHT_RULES)
+
+
+# ✅ Function to Generate AI-Driven Insights
+def generate_ai_insights(scores, answers=None):
+    """
+    Generate AI-driven insights based on the user's responses.
+    Args:
+        scores (dict): Section score per section title.
+        answers (dict): Answer score per question key, for question rules.
+    Returns:
+        list: Insight objects; ``insight.markdown`` is the results-page text.
+    """
+    return insight_engine.evaluate(scores, answers)
+
+# ✅ Define Analytics Capabilities for Each Maturity Stage
+analytics_capabilities = {
+    "Initial/Ad Hoc": {
+        "capabilities": [
+            "Descriptive Analytics: Reporting and summarizing past data.",
+            "Manual Reporting: Periodic reporting using basic tools like Excel.",
+            "Limited Automation: Minimal automation in data collection and reporting."
+        ],
+        "example": "Tracking monthly sales with basic Excel sheets."
+    },
+    "Developing": {
+        "capabilities": [
+            "Basic Diagnostic Analytics: Understanding why certain outcomes occurred.",
+            "Standardized Reports: Some standardization in reporting.",
+            "Some Automation: Introduction of basic analytics tools and dashboards."
+        ],
+        "example": "Dashboards showing sales performance against targets."
+    },
+    "Defined": {
+        "capabilities": [
+            "Predictive Analytics: Forecasting future outcomes using statistical techniques.",
+            "Automated Reporting: Self-service dashboards and automated insights.",
+            "Data-Driven Decision-Making: Reports and analysis directly influence decisions."
+        ],
+        "example": "Predicting customer churn using historical data."
+    },
+    "Managed": {
+        "capabilities": [
+            "Prescriptive Analytics: Recommending actions based on predictive models.",
+            "Advanced Reporting: Real-time dashboards and actionable insights.",
+            "Integrated Analytics: Analytics tools embedded in business processes."
+        ],
+        "example": "Dynamic product recommendations based on customer behavior."
+    },
+    "Optimized": {
+        "capabilities": [
+            "Cognitive/AI Analytics: AI-driven insights and self-learning systems.",
+            "Real-Time Decision-Making: Autonomous systems adjust to new data.",
+            "Integrated AI: AI and machine learning integrated into core business functions."
+        ],
+        "example": "Real-time pricing adjustments based on market conditions."
+    }
+}
+
+# ✅ Define Dynamic Recommendations for Each Maturity Stage
+dynamic_recommendations = {
+    "Initial/Ad Hoc": {
+        "recommendations": [
+            "Establish a formal data governance framework to define roles and responsibilities.",
+            "Implement basic data quality checks to ensure accuracy and completeness.",
+            "Start using simple reporting tools (e.g., Excel, Google Sheets) to track key metrics."
+        ],
+        "next_steps": [
+            "Move towards basic diagnostic analytics by introducing business intelligence tools (e.g., Tableau, Power BI).",
+            "Standardize reporting processes to reduce manual effort."
+        ]
+    },
+    "Developing": {
+        "recommendations": [
+            "Standardize data definitions and metadata management to improve consistency.",
+            "Automate data collection and reporting processes to reduce manual effort.",
+            "Introduce basic diagnostic analytics to understand trends and patterns."
+        ],
+        "next_steps": [
+            "Adopt predictive analytics to forecast future outcomes.",
+            "Invest in self-service dashboards to empower business users."
+        ]
+    },
+    "Defined": {
+        "recommendations": [
+            "Expand predictive analytics capabilities to forecast key business outcomes.",
+            "Integrate analytics tools into business processes for real-time decision-making.",
+            "Train staff on data-driven decision-making to maximize the value of analytics."
+        ],
+        "next_steps": [
+            "Explore prescriptive analytics to recommend actionable insights.",
+            "Integrate real-time data streams for continuous monitoring."
+        ]
+    },
+    "Managed": {
+        "recommendations": [
+            "Leverage prescriptive analytics to recommend optimal actions.",
+            "Integrate advanced analytics tools into core business functions.",
+            "Focus on real-time data processing and decision-making."
+        ],
+        "next_steps": [
+            "Adopt AI-driven analytics for cognitive insights and self-learning systems.",
+            "Explore autonomous decision-making capabilities."
+        ]
+    },
+    "Optimized": {
+        "recommendations": [
+            "Continuously refine AI and machine learning models for better accuracy.",
+            "Expand autonomous decision-making capabilities across the organization.",
+            "Foster a culture of innovation to explore new analytics use cases."
+        ],
+        "next_steps": [
+            "Stay ahead of industry trends by adopting emerging technologies.",
+            "Focus on scaling AI-driven insights across all business units."
+        ]
+    }
+}
@@ -0,0 +1,444 @@
+"""Load test: concurrent virtual respondents against a local Streamlit server.
+
+Starts ``streamlit run virtual_narrative.py`` on a free port (or targets a
+running server with ``--url``) and connects N virtual respondents to it over
+Streamlit's own websocket protocol, exactly like N browser tabs. Each respondent
+walks the whole assessment: landing page, data privacy, user info, the
+weighting questions, every section question and the PDF download, pausing for
+a random think time between clicks, then starts over with a new session.
+Clicks inside the question fragments are sent as fragment-scoped reruns, as
+the browser sends them.
+
+Every rerun is timed from the moment the click is sent to the moment the
+server reports the script run finished, so latencies are the ones a browser
+sees, including the server's message flushing and the local network stack.
+The test runs a series of load levels (``--users 1,2,4,8``) and reports per
+level the reruns per second, errors, and the p50/p95/p99 latency of every
+page, then the load at which throughput stops growing: past that point more
+respondents only make everyone wait longer.
+
+AppTest is not used for this: it installs a process-wide mock runtime for
+each run, so several AppTests cannot run at once in one process.
+
+Usage:
+    python load_test.py --users 1,2,4,8,16,32 --duration 60 --think-time 2
+    python load_test.py --url http://localhost:8501 --users 10 --duration 300
+"""
+import argparse  # For the command-line interface
+import asyncio  # One event loop drives every virtual respondent
+import json  # For the results file
+import os  # For paths and environment
+import random  # For think times and answers
+import socket  # For picking a free port
+import subprocess  # For starting the server under test
+import sys  # For the interpreter path and exit status
+import tempfile  # For isolated response and session stores
+import time  # For latency measurement
+import urllib.request  # For the health check and the PDF download
+
+import numpy as np
+
+from questionnaire import SECTIONS, WEIGHTING_QUESTIONS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(BASE_DIR, "virtual_narrative.py")
+
+# Pages in the order a respondent meets them, for the report
+PAGES = ("landing", "privacy", "user_info", "weighting", *(f"section_{section.key}" for section in SECTIONS), "pdf_queue", "pdf_file")
+
+# Seconds between two looks at the render queue, as on the results page
+REPORT_QUEUE_POLL_SECONDS = 2
+
+# Relative throughput gain below which adding respondents counts as levelled off
+PLATEAU_GAIN = 0.1
+
+_WIDGET_TYPES = ("button", "download_button", "radio", "text_input")
+
+
+class StepError(Exception):
+    """A rerun failed: the script raised, timed out or the expected widget was missing."""
+
+
+def free_port():
+    """Return a TCP port nobody is listening on."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def start_server(port, timeout=60):
+    """
+    Start the app under ``streamlit run`` with its own response store.
+    Args:
+        port (int): Port to serve on.
+        timeout (float): Seconds to wait for the health check.
+    Returns:
+        subprocess.Popen: The server process.
+    Raises:
+        RuntimeError: If the server does not come up in time.
+    """
+    env = dict(os.environ)
+    scratch = tempfile.mkdtemp(prefix="vn-load-")
+    env.setdefault("VN_RESPONSE_DB", os.path.join(scratch, "responses.db"))
+    env.setdefault("VN_SESSION_DB", os.path.join(scratch, "sessions.db"))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", SCRIPT_PATH, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f"Streamlit did not start on port {port} within {timeout:.0f}s")
+
+
+class Session:
+    """
+    One browser tab: a websocket to the server and the widgets on its page.
+    Args:
+        url (str): Base URL of the server, e.g. ``http://127.0.0.1:8501``.
+        timeout (float): Seconds a rerun may take before it counts as failed.
+    """
+
+    def __init__(self, url, timeout=60.0):
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.widgets = {}  # widget id -> (element type, proto, fragment id)
+        self.values = {}  # widget id -> WidgetState of a value the respondent set
+        self.download_url = None
+        self._socket = None
+
+    async def connect(self):
+        import websockets  # Only the load test needs a websocket client
+
+        self._socket = await websockets.connect(
+            self.url.replace("http", "ws", 1) + "/_stcore/stream",
+            subprotocols=["streamlit"], max_size=None, compression=None,
+        )
+
+    async def close(self):
+        if self._socket is not None:
+            await self._socket.close()
+            self._socket = None
+
+    def find(self, element_type, key=None, label=None):
+        """
+        Return the id of a widget on the current page.
+        Args:
+            element_type (str): "button", "radio", "text_input", ...
+            key (str): The widget's ``key``.
+            label (str): The widget's label, or a prefix ending in "*".
+        Raises:
+            StepError: If no such widget is on the page.
+        """
+        for widget_id, (kind, proto, _) in reversed(self.widgets.items()):
+            if kind != element_type:
+                continue
+            if key is not None and widget_id.endswith(f"-{key}"):
+                return widget_id
+            if label is not None and (proto.label == label or (label.endswith("*") and proto.label.startswith(label[:-1]))):
+                return widget_id
+        raise StepError(f"No {element_type} {key or label!r} on the page")
+
+    def set_radio(self, key, index):
+        """Select an option of a radio by position."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id = self.find("radio", key=key)
+        options = self.widgets[widget_id][1].options
+        self.values[widget_id] = WidgetState(id=widget_id, string_value=options[min(index, len(options) - 1)])
+
+    def set_text(self, key, text):
+        """Type into a text input."""
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        widget_id = self.find("text_input", key=key)
+        self.values[widget_id] = WidgetState(id=widget_id, string_value=text)
+
+    async def rerun(self, click=None):
+        """
+        Send a rerun, as the browser does after a click, and wait for it to finish.
+        Args:
+            click (str): Id of the button clicked; a button inside a fragment
+                reruns only that fragment.
+        Returns:
+            float: Seconds from sending the rerun to the end of the script run
+            (including any follow-up runs the script requested with st.rerun).
+        Raises:
+            StepError: If the script raised an exception or took too long.
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        message = BackMsg()
+        state = message.rerun_script
+        state.widget_states.widgets.extend(value for widget_id, value in self.values.items() if widget_id in self.widgets)
+        if click is not None:
+            state.widget_states.widgets.append(WidgetState(id=click, trigger_value=True))
+            state.fragment_id = self.widgets[click][2]
+        start = time.perf_counter()
+        await self._socket.send(message.SerializeToString())
+        try:
+            await asyncio.wait_for(self._receive_run(), self.timeout)
+        except asyncio.TimeoutError:
+            raise StepError(f"Rerun took longer than {self.timeout:.0f}s") from None
+        return time.perf_counter() - start
+
+    async def _receive_run(self):
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        error = None
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self._socket.recv())
+            kind = message.WhichOneof("type")
+            if kind == "new_session":
+                fragments = set(message.new_session.fragment_ids_this_run)
+                # A full run redraws the page; a fragment run only its own widgets
+                self.widgets = {widget_id: widget for widget_id, widget in self.widgets.items() if fragments and widget[2] not in fragments}
+            elif kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                element = message.delta.new_element
+                element_type = element.WhichOneof("type")
+                if element_type in _WIDGET_TYPES:
+                    proto = getattr(element, element_type)
+                    self.widgets[proto.id] = (element_type, proto, message.delta.fragment_id)
+                    if element_type == "download_button":
+                        self.download_url = proto.url
+                elif element_type == "exception":
+                    error = element.exception.message
+            elif kind == "script_finished":
+                status = ForwardMsg.ScriptFinishedStatus.Name(message.script_finished)
+                if status == "FINISHED_EARLY_FOR_RERUN":
+                    continue  # st.rerun(): the follow-up run is part of the same click
+                if error is not None:
+                    raise StepError(error)
+                if status == "FINISHED_WITH_COMPILE_ERROR":
+                    raise StepError("Script failed to compile")
+                return
+
+    async def download(self):
+        """Fetch the file of the last download button, as the browser does. Returns seconds taken."""
+        if not self.download_url:
+            raise StepError("No download link on the page")
+        start = time.perf_counter()
+        url = self.download_url if self.download_url.startswith("http") else f"{self.url}/{self.download_url.lstrip('/')}"
+        await asyncio.to_thread(lambda: urllib.request.urlopen(url, timeout=self.timeout).read())
+        return time.perf_counter() - start
+
+
+async def respondent_flow(session, record, think, rng):
+    """
+    Walk one respondent through the whole assessment.
+    Args:
+        session (Session): A connected session.
+        record (callable): Called as ``record(page, seconds)`` after every step.
+        think (callable): Awaitable pause between two clicks.
+        rng (random.Random): Source of the respondent's answers.
+    """
+    async def step(page, click=None):
+        record(page, await session.rerun(click))
+        await think()
+
+    await step("landing")
+    await step("privacy", session.find("button", key="start_button"))
+    await step("user_info", session.find("button", label="Continue"))
+
+    number = rng.randrange(1_000_000)
+    for key, text in (("user_first_name_input", f"Load{number}"), ("user_last_name_input", "Respondent"),
+                      ("user_email_input", f"load{number}@example.com"), ("user_org_name_input", f"Org {number % 7}"),
+                      ("user_business_unit_input", f"Unit {number % 3}")):
+        session.set_text(key, text)
+    await step("weighting", session.find("button", label="Start Assessment"))
+
+    for i, question in enumerate(WEIGHTING_QUESTIONS):
+        session.set_radio(question.key, rng.randrange(len(question.options)))
+        label = "Next ➡️" if i < len(WEIGHTING_QUESTIONS) - 1 else "Submit"
+        await step("weighting", session.find("button", label=label))
+
+    for section in SECTIONS:
+        for i, question in enumerate(section.questions):
+            session.set_radio(question.key, rng.randrange(len(question.options)))
+            label = "Next ➡️" if i < len(section.questions) - 1 else "Submit *"
+            await step(f"section_{section.key}", session.find("button", label=label))
+
+    while not any(kind == "download_button" for kind, _, _ in session.widgets.values()):
+        await asyncio.sleep(REPORT_QUEUE_POLL_SECONDS)  # Report queued behind others: poll as the page does
+        record("pdf_queue", await session.rerun())
+    record("pdf_file", await session.download())  # The button holds the finished report; no rerun
+
+
+async def run_level(url, users, duration, think_time, timeout, seed=0):
+    """
+    Keep ``users`` respondents busy for ``duration`` seconds.
+    Args:
+        url (str): Base URL of the server.
+        users (int): Concurrent virtual respondents.
+        duration (float): Seconds to measure for.
+        think_time (float): Mean pause between two clicks, in seconds
+            (exponentially distributed, capped at five times the mean).
+        timeout (float): Seconds a rerun may take before it counts as failed.
+        seed (int): Seed for think times and answers.
+    Returns:
+        dict: Latency samples and error counts per page, steps and flows completed.
+    """
+    samples = {page: [] for page in PAGES}
+    errors = {}
+    completed = {"steps": 0, "flows": 0}
+    stop_at = time.monotonic() + duration
+
+    def record(page, seconds):
+        if time.monotonic() < stop_at:
+            samples[page].append(seconds * 1000)
+            completed["steps"] += 1
+
+    async def respondent(number):
+        rng = random.Random(seed * 100_003 + number)
+
+        async def think():
+            if think_time > 0:
+                await asyncio.sleep(min(rng.expovariate(1 / think_time), 5 * think_time))
+
+        await asyncio.sleep(rng.uniform(0, think_time or 0.1))  # Stagger the arrivals
+        while time.monotonic() < stop_at:
+            session = Session(url, timeout)
+            page = "landing"
+
+            def track(step_page, seconds):
+                nonlocal page
+                page = step_page
+                record(step_page, seconds)
+
+            try:
+                await session.connect()
+                await respondent_flow(session, track, think, rng)
+                if time.monotonic() < stop_at:
+                    completed["flows"] += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:  # Any failure costs the respondent their session
+                if time.monotonic() < stop_at:
+                    key = f"{page}: {type(error).__name__}: {str(error)[:80]}"
+                    errors[key] = errors.get(key, 0) + 1
+            finally:
+                await session.close()
+
+    tasks = [asyncio.create_task(respondent(number)) for number in range(users)]
+    await asyncio.sleep(duration)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {"users": users, "duration": duration, "samples": samples, "errors": errors, **completed}
+
+
+def summarize(level):
+    """
+    Reduce a load level to throughput, error counts and latency percentiles.
+    Returns:
+        dict: Users, reruns per second, flows per minute, error count and
+        breakdown, and p50/p95/p99/max latency (ms) and sample count per page.
+    """
+    pages = {}
+    for page, values in level["samples"].items():
+        if values:
+            p50, p95, p99 = np.percentile(values, (50, 95, 99)).tolist()
+            pages[page] = {"count": len(values), "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1), "max_ms": round(max(values), 1)}
+    return {
+        "users": level["users"],
+        "reruns_per_s": round(level["steps"] / level["duration"], 2),
+        "flows_per_min": round(level["flows"] * 60 / level["duration"], 2),
+        "errors": sum(level["errors"].values()),
+        "error_breakdown": level["errors"],
+        "pages": pages,
+    }
+
+
+def find_plateau(levels, gain=PLATEAU_GAIN):
+    """
+    Find the load at which throughput levels off.
+    Args:
+        levels (list): summarize() results in increasing order of users.
+        gain (float): Smallest relative throughput gain that still counts as
+            growth when going to the next level.
+    Returns:
+        dict: The last level that still grew (users and reruns per second),
+        or None if throughput kept growing up to the highest level tried.
+    """
+    for previous, current in zip(levels, levels[1:]):
+        if current["reruns_per_s"] < previous["reruns_per_s"] * (1 + gain):
+            return {"users": previous["users"], "reruns_per_s": previous["reruns_per_s"]}
+    return None
+
+
+def format_report(levels, plateau):
+    """Render the throughput of every level and the page latencies of each."""
+    lines = [f"{'users':>6}{'reruns/s':>10}{'flows/min':>11}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"]
+    for level in levels:
+        every = [page for page in level["pages"].values()]
+        worst = {p: max((page[p] for page in every), default=0.0) for p in ("p50_ms", "p95_ms", "p99_ms")}
+        lines.append(f"{level['users']:>6}{level['reruns_per_s']:>10.2f}{level['flows_per_min']:>11.2f}{level['errors']:>8}"
+                     f"{worst['p50_ms']:>9.1f}{worst['p95_ms']:>9.1f}{worst['p99_ms']:>9.1f}")
+    lines.append("(latency columns: slowest page)")
+    for level in levels:
+        lines.append("")
+        lines.append(f"{level['users']} users")
+        lines.append(f"  {'page':<28}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+        for page, stats in level["pages"].items():
+            lines.append(f"  {page:<28}{stats['count']:>7}{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}{stats['max_ms']:>9.1f}")
+        for error, count in level["error_breakdown"].items():
+            lines.append(f"  ERROR x{count}: {error}")
+    lines.append("")
+    if plateau:
+        lines.append(f"Throughput levels off at about {plateau['users']} users ({plateau['reruns_per_s']:.2f} reruns/s)")
+    else:
+        lines.append("Throughput was still growing at the highest load tried")
+    return "\n".join(lines)
+
+
+async def load_test(url, users, duration, think_time, timeout):
+    levels = []
+    for count in users:
+        print(f"Running {count} users for {duration:.0f}s ...", file=sys.stderr)
+        levels.append(summarize(await run_level(url, count, duration, think_time, timeout)))
+    return levels
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the assessment with concurrent virtual respondents.")
+    parser.add_argument("--url", help="Server to test (default: start one on a free port)")
+    parser.add_argument("--users", default="1,2,4,8", help="Comma-separated load levels (default: 1,2,4,8)")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per load level (default: 30)")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between clicks (default: 1)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a rerun counts as failed (default: 60)")
+    parser.add_argument("--output", metavar="PATH", help="Also write the results JSON here")
+    args = parser.parse_args(argv)
+    users = sorted({int(count) for count in args.users.split(",")})
+
+    server = None
+    url = args.url
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url = f"http://127.0.0.1:{port}"
+    try:
+        levels = asyncio.run(load_test(url, users, args.duration, args.think_time, args.timeout))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    plateau = find_plateau(levels)
+    print(format_report(levels, plateau))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump({"url": url, "think_time": args.think_time, "levels": levels, "plateau": plateau}, file, indent=2)
+    return 1 if any(level["errors"] for level in levels) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,251 @@
+"""In-process timing histograms exported in the Prometheus text format.
+
+Timing spans wrap each page of virtual_narrative.py and the heavy functions it
+calls (landing header, privacy policy, question fragments, result snapshot,
+gauge chart, background PDF render, PDF download). Each finished span adds its
+duration to a histogram labelled by span, page and section; a span costs two
+``perf_counter`` calls and a locked bucket increment, and nothing at all when it
+is not sampled.
+
+The histograms are exposed in the Prometheus text exposition format:
+
+- on ``http://127.0.0.1:$VN_METRICS_PORT/metrics`` when ``VN_METRICS_PORT`` is set;
+- in the file ``$VN_METRICS_FILE``, rewritten every ``VN_METRICS_INTERVAL``
+  seconds (default 15), for node_exporter's textfile collector;
+- on the admin view, which can also change the sampling rate while the server
+  runs.
+
+The share of spans recorded starts at ``VN_METRICS_SAMPLE_RATE`` (default 1,
+every span; 0 turns timing off).
+"""
+import bisect  # For finding a duration's bucket
+import contextlib  # For timing spans
+import functools  # For timed functions
+import os  # For the exporter settings
+import random  # For sampling
+import threading  # Spans are recorded from every script thread
+import time  # For durations and the file exporter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # For the metrics endpoint
+
+# Upper bounds of the histogram buckets, in seconds (Prometheus' defaults plus finer steps below 5 ms)
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_NAME = "vn_span_duration_seconds"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value):
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metrics:
+    """
+    Registry of span duration histograms.
+    Args:
+        sample_rate (float): Share of spans recorded, from 0 (off) to 1 (all).
+        buckets (tuple): Ascending bucket upper bounds, in seconds.
+    """
+
+    def __init__(self, sample_rate=1.0, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.sample_rate = 0.0
+        self.set_sample_rate(sample_rate)
+        self._series = {}  # (span, page, section) -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+        self._gauges = {}  # name -> (help text, type, function returning the value)
+        self._exporters_started = False
+        self.exporter_errors = []
+
+    def set_sample_rate(self, rate):
+        """Change the share of spans recorded; takes effect on the next span."""
+        self.sample_rate = min(max(float(rate), 0.0), 1.0)
+
+    def observe(self, span, seconds, page="", section=""):
+        """
+        Add one duration to a histogram.
+        Args:
+            span (str): What was timed, e.g. "script_run" or "pdf_report".
+            seconds (float): Duration.
+            page (str): Page the respondent was on.
+            section (str): Assessment section key, if any.
+        """
+        index = bisect.bisect_left(self.buckets, seconds)
+        key = (span, page, section)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += seconds
+
+    def sampled(self):
+        """Decide whether the next span is recorded."""
+        rate = self.sample_rate
+        return rate >= 1.0 or (rate > 0.0 and random.random() < rate)
+
+    @contextlib.contextmanager
+    def span(self, name, page="", section=""):
+        """
+        Time a block of code, including one left by an exception such as
+        Streamlit's rerun and stop signals.
+        Args:
+            name (str): Span name.
+            page (str): Page label.
+            section (str): Section label.
+        """
+        if not self.sampled():
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, page, section)
+
+    def timed(self, name, page="", section=""):
+        """
+        Decorator timing every call of a function as a span.
+        Args:
+            name (str): Span name.
+            page (str): Page label.
+            section (str or callable): Section label, or a function of the
+                call's arguments returning it.
+        """
+        def decorator(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                label = section(*args, **kwargs) if callable(section) else section
+                with self.span(name, page, label):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def register_gauge(self, name, help_text, function, kind="gauge"):
+        """
+        Expose a value read when the metrics are rendered, such as a queue length.
+        Args:
+            name (str): Metric name.
+            help_text (str): Metric description.
+            function (callable): Returns the current value.
+            kind (str): Prometheus metric type, "gauge" or "counter".
+        """
+        with self._lock:
+            self._gauges[name] = (help_text, kind, function)
+
+    def reset(self):
+        """Drop every recorded duration."""
+        with self._lock:
+            self._series.clear()
+
+    def snapshot(self):
+        """
+        Summarize the recorded spans.
+        Returns:
+            dict: (span, page, section) to count, total seconds and mean seconds.
+        """
+        with self._lock:
+            series = {key: (sum(values[:-1]), values[-1]) for key, values in self._series.items()}
+        return {key: {"count": count, "sum_s": total, "mean_s": total / count if count else 0.0} for key, (count, total) in sorted(series.items())}
+
+    def render(self):
+        """
+        Render the gauges and every histogram in the Prometheus text exposition format.
+        Returns:
+            str: The exposition text.
+        """
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+            gauges = sorted(self._gauges.items())
+        lines = [
+            "# HELP vn_metrics_sample_rate Share of timing spans recorded.",
+            "# TYPE vn_metrics_sample_rate gauge",
+            f"vn_metrics_sample_rate {_number(self.sample_rate)}",
+        ]
+        for name, (help_text, kind, function) in gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {_number(function())}"]
+        lines += [
+            f"# HELP {METRIC_NAME} Duration of app pages and heavy functions.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for (span, page, section), values in sorted(series.items()):
+            labels = f'span="{_label_value(span)}",page="{_label_value(page)}",section="{_label_value(section)}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{le}"}} {cumulative}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {_number(values[-1])}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path):
+        """Write the exposition text to a file atomically, as the textfile collector expects."""
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(self.render())
+        os.replace(temporary, path)
+
+    def start_exporters(self, port=None, path=None, interval=None):
+        """
+        Start the HTTP endpoint and the file writer configured by the
+        environment, once per process. Failures are kept in ``exporter_errors``
+        instead of breaking the app.
+        Args:
+            port (int): Port of the metrics endpoint; defaults to VN_METRICS_PORT.
+            path (str): Metrics file; defaults to VN_METRICS_FILE.
+            interval (float): Seconds between file writes; defaults to VN_METRICS_INTERVAL.
+        """
+        with self._lock:
+            if self._exporters_started:
+                return
+            self._exporters_started = True
+        port = port or os.environ.get("VN_METRICS_PORT")
+        path = path or os.environ.get("VN_METRICS_FILE")
+        interval = float(interval or os.environ.get("VN_METRICS_INTERVAL", "15"))
+        if port:
+            try:
+                server = ThreadingHTTPServer(("127.0.0.1", int(port)), _handler(self))
+            except (OSError, ValueError) as error:
+                self.exporter_errors.append(f"metrics endpoint on port {port}: {error}")
+            else:
+                threading.Thread(target=server.serve_forever, name="metrics-endpoint", daemon=True).start()
+        if path:
+            threading.Thread(target=self._write_periodically, args=(path, interval), name="metrics-file", daemon=True).start()
+
+    def _write_periodically(self, path, interval):
+        while True:
+            try:
+                self.write_file(path)
+            except OSError as error:
+                self.exporter_errors.append(f"metrics file {path}: {error}")
+                return
+            time.sleep(interval)
+
+
+def _handler(registry):
+    """Build a request handler serving ``registry`` on /metrics."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Scrapes are not worth a line on the server's stderr
+
+    return MetricsHandler
+
+
+# ✅ Shared registry, sampling VN_METRICS_SAMPLE_RATE of the spans (default: all)
+metrics = Metrics(sample_rate=float(os.environ.get("VN_METRICS_SAMPLE_RATE", "1")))
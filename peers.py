@@ -0,0 +1,110 @@
+"""Peer percentiles: where a respondent's scores sit among all respondents.
+
+One KLL quantile sketch per metric (the weighted average score and each
+section score) summarizes every stored submission in a few kilobytes. Like the
+cohort aggregates, the sketches are updated by the response store's writer
+inside the transaction that stores each batch, and persisted next to the
+submissions; the results page then ranks a score with a binary search over the
+sketch, in constant time and memory however many responses have been
+collected.
+"""
+import sqlite3  # For a store without the sketch table yet
+
+from quantile_sketch import KLLSketch
+from scoring import SECTION_TITLES
+from stored_aggregate import StoredAggregate
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS score_sketches (
+    metric TEXT PRIMARY KEY,
+    sketch BLOB NOT NULL
+)
+"""
+
+OVERALL = "Overall"
+METRICS = (OVERALL,) + SECTION_TITLES
+
+# Peers needed before the results page shows a comparison
+MIN_PEERS = 20
+
+
+class PeerPercentiles(StoredAggregate):
+    """
+    Quantile sketches of the overall and section scores of all respondents.
+    Args:
+        path (str): Database file shared with the response store.
+        k (int): Sketch accuracy parameter (rank error about 1.7/k).
+    """
+
+    def __init__(self, path=None, k=200):
+        super().__init__(path)
+        self.k = k
+        self._sketches = {metric: KLLSketch(k) for metric in METRICS}
+
+    def _reset(self):
+        self._sketches = {metric: KLLSketch(self.k) for metric in METRICS}
+
+    def _read(self, connection):
+        try:
+            rows = dict(connection.execute("SELECT metric, sketch FROM score_sketches"))
+        except sqlite3.OperationalError:
+            rows = {}  # No sketch table yet
+        self._sketches = {metric: KLLSketch.from_bytes(rows[metric]) if metric in rows else KLLSketch(self.k) for metric in METRICS}
+
+    def _count(self):
+        counts = {sketch.n for sketch in self._sketches.values()}
+        return counts.pop() if len(counts) == 1 else -1  # Sketches out of step with each other: rebuild
+
+    def _add(self, records, scores):
+        self._sketches[OVERALL].extend(scores.overall.tolist())
+        for column, title in enumerate(SECTION_TITLES):
+            self._sketches[title].extend(scores.section_scores[:, column].tolist())
+
+    def _save(self, connection, changed=None):
+        connection.execute(SCHEMA)
+        connection.executemany(
+            "INSERT OR REPLACE INTO score_sketches (metric, sketch) VALUES (?, ?)",
+            [(metric, sketch.to_bytes()) for metric, sketch in self._sketches.items()],
+        )
+
+    def _save_all(self, connection):
+        self._save(connection)  # Every sketch changes with every batch
+
+    def top_share(self, metric, score):
+        """
+        Share of respondents scoring at least as high as ``score``, e.g. 0.18
+        for "top 18%".
+        Args:
+            metric (str): OVERALL or a section title.
+            score (float): The respondent's score.
+        Returns:
+            tuple: (share, number of respondents in the sketch).
+        """
+        with self._lock:
+            self._ensure_loaded()
+            sketch = self._sketches[metric]
+            return 1.0 - sketch.rank(score), sketch.n
+
+    def compare(self, overall, section_scores, min_peers=MIN_PEERS):
+        """
+        Rank a respondent against everyone on every metric.
+        Args:
+            overall (float): Weighted average maturity score.
+            section_scores (dict): Score per section title.
+            min_peers (int): Fewest respondents needed for a comparison.
+        Returns:
+            dict: Metric to top share, or an empty dict when there are too few
+            respondents to compare against.
+        """
+        share, peers = self.top_share(OVERALL, overall)
+        if peers < min_peers:
+            return {}
+        shares = {OVERALL: share}
+        for title in SECTION_TITLES:
+            shares[title] = self.top_share(title, section_scores[title])[0]
+        return shares
+
+
+# ✅ Shared sketches, kept current by the response store's writer
+peer_percentiles = PeerPercentiles()
+peer_percentiles.attach()
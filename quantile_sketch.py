@@ -0,0 +1,143 @@
+"""Mergeable streaming quantile sketch (KLL).
+
+A KLL sketch summarizes a stream of numbers in O(k log(n/k)) memory and answers
+rank and quantile queries with an error of about 1.7/k of the stream length,
+whatever the stream's size. Values are held in a stack of compactors: level h
+holds items of weight 2**h, and when a level outgrows its capacity it is sorted
+and every other item, from a random offset, is promoted to the next level.
+Two sketches merge by concatenating their levels and compacting.
+
+Reference: Karnin, Lang and Liberty, "Optimal Quantile Approximation in
+Streams" (FOCS 2016).
+"""
+import bisect  # For rank queries on the cached CDF
+import random  # For the compaction offset
+import struct  # For the compact binary form
+from array import array  # For packing levels
+from itertools import accumulate  # For cumulative weights
+
+_HEADER = struct.Struct("<IQI")  # k, n, number of levels
+_C = 2 / 3  # Capacity decay from one level to the one below
+
+
+class KLLSketch:
+    """
+    Streaming quantile sketch.
+    Args:
+        k (int): Accuracy parameter; the top compactor holds k items and the
+            rank error is about 1.7/k.
+        seed (int): Seed of the compaction coin, for reproducible sketches.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.levels = [[]]
+        self._random = random.Random(seed)
+        self._cdf = None  # (sorted values, cumulative weights), rebuilt lazily after updates
+
+    def _capacity(self, level):
+        return max(int(self.k * _C ** (len(self.levels) - level - 1)) + 1, 2)
+
+    def _size(self):
+        return sum(len(items) for items in self.levels)
+
+    def _max_size(self):
+        return sum(self._capacity(level) for level in range(len(self.levels)))
+
+    def _compress(self):
+        while self._size() >= self._max_size():
+            for level, items in enumerate(self.levels):
+                if len(items) >= self._capacity(level):
+                    if level + 1 == len(self.levels):
+                        self.levels.append([])
+                    items.sort()
+                    offset = self._random.getrandbits(1)
+                    self.levels[level + 1].extend(items[offset::2])
+                    self.levels[level] = []
+                    break
+
+    def update(self, value):
+        """Add one value to the sketch."""
+        self.levels[0].append(float(value))
+        self.n += 1
+        self._cdf = None
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def extend(self, values):
+        """Add many values to the sketch."""
+        for value in values:
+            self.update(value)
+
+    def merge(self, other):
+        """
+        Fold another sketch into this one.
+        Args:
+            other (KLLSketch): Sketch of another stream; left unchanged.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self._cdf = None
+        self._compress()
+
+    def _weighted(self):
+        if self._cdf is None:
+            pairs = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+            self._cdf = ([value for value, _ in pairs], list(accumulate(weight for _, weight in pairs)))
+        return self._cdf
+
+    def rank(self, value, inclusive=False):
+        """
+        Estimate the fraction of the stream below a value.
+        Args:
+            value (float): Value to rank.
+            inclusive (bool): Count values equal to ``value`` as below it.
+        Returns:
+            float: Fraction in [0, 1]; 0 for an empty sketch.
+        """
+        values, cumulative = self._weighted()
+        if not values:
+            return 0.0
+        index = (bisect.bisect_right if inclusive else bisect.bisect_left)(values, value)
+        return (cumulative[index - 1] if index else 0) / cumulative[-1]
+
+    def quantile(self, fraction):
+        """
+        Estimate the value at a given fraction of the stream.
+        Args:
+            fraction (float): Fraction in [0, 1].
+        Returns:
+            float: The estimated quantile, or None for an empty sketch.
+        """
+        values, cumulative = self._weighted()
+        if not values:
+            return None
+        index = bisect.bisect_left(cumulative, fraction * cumulative[-1])
+        return values[min(index, len(values) - 1)]
+
+    def to_bytes(self):
+        """Serialize the sketch: a small header, the level sizes, then the values as doubles."""
+        sizes = array("I", (len(items) for items in self.levels))
+        values = array("d", (value for items in self.levels for value in items))
+        return _HEADER.pack(self.k, self.n, len(self.levels)) + sizes.tobytes() + values.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data, seed=None):
+        """Restore a sketch serialized with to_bytes."""
+        k, n, level_count = _HEADER.unpack_from(data)
+        sketch = cls(k, seed)
+        sketch.n = n
+        offset = _HEADER.size
+        sizes = array("I")
+        sizes.frombytes(data[offset:offset + level_count * sizes.itemsize])
+        values = array("d")
+        values.frombytes(data[offset + level_count * sizes.itemsize:])
+        sketch.levels, start = [], 0
+        for size in sizes:
+            sketch.levels.append(values[start:start + size].tolist())
+            start += size
+        return sketch
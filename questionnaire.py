@@ -0,0 +1,433 @@
+"""Declarative question bank for the Data Maturity Assessment.
+
+Every section, question and answer option is defined once here as immutable
+tuples. Option labels are built at import time and each option's score sits at
+the same index in ``Question.scores``, so a selected option index maps to its
+score by direct lookup. virtual_narrative.py renders any section from these
+structures, and adding a question or a section only means adding data here.
+"""
+from typing import NamedTuple
+
+
+class Question(NamedTuple):
+    """A single-choice question."""
+    key: str  # Widget key, also used to name the stored response
+    prompt: str  # Markdown shown above the options
+    options: tuple  # Display labels, e.g. "Reviewed annually (4)"
+    scores: tuple  # Integer score of each option, by option index
+
+
+class Section(NamedTuple):
+    """One pillar of data maturity and its questions."""
+    key: str  # Prefix of the section's completion flag in session state
+    title: str  # Pillar name, also the key of its weight
+    heading: str
+    intro: str
+    default_weight: float  # Weight used until the weighting page is submitted
+    submit_label: str  # Label of the button on the last question
+    success_message: str  # Shown once the section is submitted; formatted with first_name
+    questions: tuple
+
+    @property
+    def complete_flag(self):
+        """Session state flag set once the section has been submitted."""
+        return f"{self.key}_complete"
+
+
+def _question(key, prompt, choices):
+    """
+    Build a Question from (label, score) pairs.
+    Args:
+        key (str): Widget key of the question.
+        prompt (str): Question text.
+        choices (tuple): (label, score) pairs, in display order.
+    Returns:
+        Question: The question, with the score appended to each label.
+    """
+    return Question(
+        key,
+        prompt,
+        tuple(f"{label} ({score})" for label, score in choices),
+        tuple(score for _, score in choices),
+    )
+
+
+# ✅ Dynamic weighting questions, one per section and in the same order
+WEIGHTING_QUESTIONS = (
+    _question(
+        "q0",
+        "1️⃣ How important is it for your organization to have clear <span style='text-decoration: underline dotted;'>data governance</span> policies, including ownership and accountability?",
+        (
+            ("Not Important", 1),
+            ("Slightly Important", 2),
+            ("Moderately Important", 3),
+            ("Very Important", 4),
+            ("Extremely Important", 5),
+        ),
+    ),
+    _question(
+        "q1",
+        "2️⃣ How critical is <span style='text-decoration: underline dotted;'>data quality</span>—ensuring accuracy and completeness—for your organization's decision-making?",
+        (
+            ("Not Critical", 1),
+            ("Slightly Critical", 2),
+            ("Moderately Critical", 3),
+            ("Very Critical", 4),
+            ("Extremely Critical", 5),
+        ),
+    ),
+    _question(
+        "q2",
+        "3️⃣ How important is <span style='text-decoration: underline dotted;'>metadata management</span>, such as maintaining a centralized metadata repository, for your organization?",
+        (
+            ("Not Important", 1),
+            ("Slightly Important", 2),
+            ("Moderately Important", 3),
+            ("Very Important", 4),
+            ("Extremely Important", 5),
+        ),
+    ),
+    _question(
+        "q3",
+        "4️⃣ How important is <span style='text-decoration: underline dotted;'>data integration</span>, ensuring seamless connectivity across different systems, for your organization?",
+        (
+            ("Not Important", 1),
+            ("Slightly Important", 2),
+            ("Moderately Important", 3),
+            ("Very Important", 4),
+            ("Extremely Important", 5),
+        ),
+    ),
+    _question(
+        "q4",
+        "5️⃣ How important is leveraging <span style='text-decoration: underline dotted;'>data analytics and AI</span> for decision-making in your organization?",
+        (
+            ("Not Important", 1),
+            ("Slightly Important", 2),
+            ("Moderately Important", 3),
+            ("Very Important", 4),
+            ("Extremely Important", 5),
+        ),
+    ),
+    _question(
+        "q5",
+        "6️⃣ How important is <span style='text-decoration: underline dotted;'>data security</span>, including compliance with regulations, for your organization?",
+        (
+            ("Not Important", 1),
+            ("Slightly Important", 2),
+            ("Moderately Important", 3),
+            ("Very Important", 4),
+            ("Extremely Important", 5),
+        ),
+    ),
+)
+
+WEIGHTING_SUCCESS_MESSAGE = "Awesome work, {first_name}! – Weights set!✅ You’ve made it to the Data Governance section 🔐. Lets see how well your organization is managing data ownership and accountability"
+
+# ✅ Assessment sections, in the order they are presented
+SECTIONS = (
+    Section(
+        key="data_governance",
+        title="Data Governance",
+        heading="## 🏛️ Section 1: Data Governance",
+        intro="This section assesses how well data governance is established in your organization.",
+        default_weight=0.20,
+        submit_label="Submit Governance Responses",
+        success_message="Awesome work, {first_name}! – On to Data Quality! 📊 How do you ensure that your data is accurate, complete and consistent?",
+        questions=(
+            _question(
+                "gov_q1",
+                "1️⃣ **Does your organization have a formal Data Governance policy?**",
+                (
+                    ("No governance exists", 1),
+                    ("Some informal rules, but not enforced", 2),
+                    ("Formal governance in place, but not consistently followed", 3),
+                    ("Governance is standardized and monitored", 4),
+                    ("Governance is automated, AI-driven, and continuously optimized", 5),
+                ),
+            ),
+            _question(
+                "gov_q2",
+                "2️⃣ **Are roles and responsibilities clearly defined? (e.g., Data Stewards, Chief Data Officer)?**",
+                (
+                    ("No defined roles", 1),
+                    ("Some responsibilities exist but unclear", 2),
+                    ("Defined roles exist, but accountability is weak", 3),
+                    ("Roles are well-defined and monitored", 4),
+                    ("Governance roles are optimized and continuously improved", 5),
+                ),
+            ),
+            _question(
+                "gov_q3",
+                "3️⃣ **How frequently is your Data Governance policy reviewed and updated?**",
+                (
+                    ("Never", 1),
+                    ("Ad-hoc updates with no schedule", 2),
+                    ("Reviewed every few years", 3),
+                    ("Reviewed annually", 4),
+                    ("Continuously improved with data-driven feedback", 5),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        key="data_quality",
+        title="Data Quality",
+        heading="## 📊 Section 2: Data Quality",
+        intro="This section evaluates how well your organization maintains accurate, complete, and reliable data.",
+        default_weight=0.20,
+        submit_label="Submit Data Quality Responses",
+        success_message="You’re on fire 🔥 {first_name}! Now let’s take a look at how your metadata is being managed and if it’s in a centralized place. 📚",
+        questions=(
+            _question(
+                "dq1",
+                "1️⃣ **How does your organization ensure data accuracy?**",
+                (
+                    ("No process for accuracy", 1),
+                    ("Basic manual checks", 2),
+                    ("Defined validation rules", 3),
+                    ("Automated quality checks", 4),
+                    ("AI-powered real-time monitoring", 5),
+                ),
+            ),
+            _question(
+                "dq2",
+                "2️⃣ **How is data completeness ensured in your organization?**",
+                (
+                    ("No strategy in place", 1),
+                    ("Manual data entry reviews", 2),
+                    ("Automated missing value checks", 3),
+                    ("Proactive data validation", 4),
+                    ("Machine learning-driven data integrity", 5),
+                ),
+            ),
+            _question(
+                "dq3",
+                "3️⃣ **How consistently is data updated and synchronized across systems?**",
+                (
+                    ("No updates, data silos exist", 1),
+                    ("Periodic manual updates", 2),
+                    ("Automated scheduled updates", 3),
+                    ("Real-time data sync", 4),
+                    ("Self-healing, AI-driven consistency", 5),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        key="metadata_management",
+        title="Metadata Management",
+        heading="## 🏷 Section 3: Metadata Management",
+        intro="This section evaluates how well your organization manages metadata, including data definitions, lineage, and classification.",
+        default_weight=0.15,
+        submit_label="Submit Metadata Management Responses",
+        success_message="That was easy, right? Great job {first_name}! Moving on to Data Integration 🔗! Is your data flowing seamlessly across systems?",
+        questions=(
+            _question(
+                "mm1",
+                "1️⃣ **Does your organization maintain a centralized metadata repository?**",
+                (
+                    ("No metadata repository exists", 1),
+                    ("Some metadata exists in scattered documentation", 2),
+                    ("A structured metadata catalog is available", 3),
+                    ("A centralized metadata repository is maintained", 4),
+                    ("Fully automated metadata management with AI-driven lineage tracking", 5),
+                ),
+            ),
+            _question(
+                "mm2",
+                "2️⃣ **How well-defined and standardized are your data definitions?**",
+                (
+                    ("No definitions exist", 1),
+                    ("Ad-hoc definitions in some areas", 2),
+                    ("Standardized definitions exist but not enforced", 3),
+                    ("Organization-wide metadata standards are enforced", 4),
+                    ("AI-driven metadata governance ensures full compliance", 5),
+                ),
+            ),
+            _question(
+                "mm3",
+                "3️⃣ **How is data lineage tracked in your organization?**",
+                (
+                    ("No lineage tracking", 1),
+                    ("Basic manual lineage documentation", 2),
+                    ("Automated lineage tracking for some systems", 3),
+                    ("Comprehensive automated lineage tracking", 4),
+                    ("AI-driven lineage tracking with real-time anomaly detection", 5),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        key="data_integration",
+        title="Data Integration",
+        heading="## 🔗 Section 4: Data Integration",
+        intro="This section evaluates how well data is integrated across your organization, ensuring seamless interoperability.",
+        default_weight=0.15,
+        submit_label="Submit Data Integration Responses",
+        success_message="Awesome work, {first_name}! You're almost halfway there! 🤖 Time to explore how well you're using analytics and AI to make decisions.",
+        questions=(
+            _question(
+                "di1",
+                "1️⃣ **How does your organization handle data integration between different systems?**",
+                (
+                    ("No integration exists", 1),
+                    ("Manual data transfers", 2),
+                    ("Basic ETL processes in place", 3),
+                    ("Automated API-based data flows", 4),
+                    ("Real-time AI-driven integration across platforms", 5),
+                ),
+            ),
+            _question(
+                "di2",
+                "2️⃣ **How frequently does your organization update and synchronize data across different platforms?**",
+                (
+                    ("Never", 1),
+                    ("Occasionally with manual intervention", 2),
+                    ("Automated updates on a scheduled basis", 3),
+                    ("Near real-time synchronization", 4),
+                    ("AI-driven, self-healing data synchronization", 5),
+                ),
+            ),
+            _question(
+                "di3",
+                "3️⃣ **Does your organization utilize cloud-based data integration platforms?**",
+                (
+                    ("No cloud integration", 1),
+                    ("Limited use of cloud data storage", 2),
+                    ("Some cloud integration but no automation", 3),
+                    ("Fully automated cloud-based integration", 4),
+                    ("AI-optimized multi-cloud integration", 5),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        key="data_analytics",
+        title="Data Analytics & AI",
+        heading="## 📊 Section 5: Data Analytics & AI",
+        intro="This section assesses your organization's ability to leverage data analytics and AI for decision-making.",
+        default_weight=0.15,
+        submit_label="Submit Data Analytics & AI Responses",
+        success_message="You’re on fire 🔥 {first_name}! Just a few more steps! 🔒 How secure is your data? Let’s make sure everything is locked down.",
+        questions=(
+            _question(
+                "ai1",
+                "1️⃣ **What is the level of adoption of business intelligence and reporting in your organization?**",
+                (
+                    ("No formal reporting", 1),
+                    ("Basic manual reports with spreadsheets", 2),
+                    ("Automated dashboards with static reports", 3),
+                    ("Interactive BI tools with real-time data", 4),
+                    ("AI-driven predictive analytics and self-service BI", 5),
+                ),
+            ),
+            _question(
+                "ai2",
+                "2️⃣ **How is machine learning used in your organization?**",
+                (
+                    ("Not used at all", 1),
+                    ("Basic experiments without production deployment", 2),
+                    ("Some predictive models used in decision-making", 3),
+                    ("Machine learning models are embedded in core processes", 4),
+                    ("AI-driven automation and decision intelligence across the business", 5),
+                ),
+            ),
+            _question(
+                "ai3",
+                "3️⃣ **How well is AI governance and ethics considered in your organization?**",
+                (
+                    ("No AI governance in place", 1),
+                    ("Basic awareness but no formal guidelines", 2),
+                    ("AI policies exist but are inconsistently followed", 3),
+                    ("AI governance is well-defined and monitored", 4),
+                    ("AI ethics, bias detection, and compliance are actively managed", 5),
+                ),
+            ),
+        ),
+    ),
+    Section(
+        key="data_security",
+        title="Data Security & Privacy",
+        heading="## 🔒 Section 6: Data Security & Privacy",
+        intro="This section evaluates how well your organization ensures data security, privacy, and compliance with regulations.",
+        default_weight=0.15,
+        submit_label="Submit Data Security & Privacy Responses",
+        success_message="🎉 Congratulations, {first_name}! You've completed the assessment! Here’s how your data maturity looks:",
+        questions=(
+            _question(
+                "sp1",
+                "1️⃣ **How is access to sensitive data controlled in your organization?**",
+                (
+                    ("No access control", 1),
+                    ("Basic password protection", 2),
+                    ("Role-based access control (RBAC) in place", 3),
+                    ("Multi-factor authentication and encryption", 4),
+                    ("Zero-trust security model with continuous monitoring", 5),
+                ),
+            ),
+            _question(
+                "sp2",
+                "2️⃣ **Does your organization comply with data protection regulations (e.g., GDPR, HIPAA, Kenya Data Protection Act)?**",
+                (
+                    ("No compliance efforts", 1),
+                    ("Minimal awareness, but no formal compliance", 2),
+                    ("Compliance policies exist but are inconsistently followed", 3),
+                    ("Fully compliant with regular audits", 4),
+                    ("Continuous compliance monitoring and automated reporting", 5),
+                ),
+            ),
+            _question(
+                "sp3",
+                "3️⃣ **How well does your organization handle data encryption and secure storage?**",
+                (
+                    ("No encryption", 1),
+                    ("Basic encryption for some data", 2),
+                    ("Encryption used for sensitive data", 3),
+                    ("Industry-standard encryption applied across systems", 4),
+                    ("End-to-end encryption with automated security updates", 5),
+                ),
+            ),
+        ),
+    ),
+)
+
+# All section questions in presentation order, and an index by widget key
+QUESTIONS = tuple(question for section in SECTIONS for question in section.questions)
+QUESTIONS_BY_KEY = {question.key: question for question in QUESTIONS + WEIGHTING_QUESTIONS}
+
+
+def default_weights():
+    """
+    Return the section weights used before the weighting page is submitted.
+    Returns:
+        dict: Weight per section title.
+    """
+    return {section.title: section.default_weight for section in SECTIONS}
+
+
+# ✅ Compact answers: one byte per question holding the selected option index,
+# weighting questions first, then the section questions in presentation order
+ANSWER_QUESTIONS = WEIGHTING_QUESTIONS + QUESTIONS
+ANSWER_SLOTS = {question.key: slot for slot, question in enumerate(ANSWER_QUESTIONS)}
+
+
+def new_answers():
+    """
+    Return an answer vector with the first option selected everywhere.
+    Returns:
+        bytearray: One option index per question, in ANSWER_SLOTS order.
+    """
+    return bytearray(len(ANSWER_QUESTIONS))
+
+
+def answer_label(answers, key):
+    """
+    Look up the display text of the option selected for a question.
+    Args:
+        answers (bytearray): Answer vector.
+        key (str): Question key.
+    Returns:
+        str: The selected option's label.
+    """
+    return QUESTIONS_BY_KEY[key].options[answers[ANSWER_SLOTS[key]]]
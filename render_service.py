@@ -0,0 +1,190 @@
+"""Bounded worker pool for slow renders such as the PDF report.
+
+A burst of submissions (a whole workshop finishing the assessment together)
+must not turn into dozens of concurrent renders on Streamlit's script threads,
+where they compete for the GIL with every other session's reruns. Renders are
+queued to a fixed number of worker threads instead:
+
+- at most ``workers`` renders run at once;
+- at most ``max_queue`` wait; further submissions are rejected with
+  ``ServiceBusy`` (or block for a slot, when the caller asks to);
+- a render already queued or running under the same key is shared.
+
+A render that raises is logged with its traceback and counted against its
+key; callers read the count with ``failures`` to stop re-queueing a render
+that keeps failing. A successful render clears it.
+
+Queue wait and render durations are recorded as timing spans in the shared
+metrics registry; queue length, running renders and rejections are read from
+``stats``.
+"""
+import collections  # For the FIFO queue and the failure counts
+import logging  # For failed renders
+import threading  # For the workers
+import time  # For queue wait times
+from concurrent.futures import Future  # Handed to callers waiting for a render
+
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Keys whose failures are remembered; the oldest are forgotten first
+MAX_FAILED_KEYS = 1024
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when a render is submitted while the queue is full."""
+
+
+class _Job:
+    """One queued render."""
+    __slots__ = ("key", "function", "args", "future", "enqueued_at")
+
+    def __init__(self, key, function, args):
+        self.key = key
+        self.function = function
+        self.args = args
+        self.future = Future()
+        self.enqueued_at = time.perf_counter()
+
+
+class RenderService:
+    """
+    Fixed-size pool of render workers fed by a bounded FIFO queue.
+    Args:
+        workers (int): Renders running at the same time.
+        max_queue (int): Renders allowed to wait for a worker.
+        name (str): Prefix of the worker threads and of the timing spans
+            ("<name>_queue_wait", "<name>_render").
+    """
+
+    def __init__(self, workers=2, max_queue=32, name="render"):
+        self.workers = max(int(workers), 1)
+        self.max_queue = max(int(max_queue), 0)
+        self.name = name
+        self._queue = collections.deque()
+        self._jobs = {}  # key -> job queued or running
+        self._failures = collections.OrderedDict()  # key -> failed renders in a row
+        self._condition = threading.Condition()
+        self._threads = []
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def _ensure_workers(self):
+        # Called with the condition held; workers start with the first render
+        while len(self._threads) < self.workers:
+            thread = threading.Thread(target=self._run, name=f"{self.name}-worker-{len(self._threads) + 1}", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def submit(self, key, function, *args, block=False, timeout=None):
+        """
+        Queue ``function(*args)`` unless a render with the same key is already
+        queued or running.
+        Args:
+            key (str): Identity of the render, e.g. the report fingerprint.
+            function (callable): The render.
+            block (bool): Wait for room in the queue instead of failing.
+            timeout (float): Longest wait for room, in seconds, when blocking.
+        Returns:
+            concurrent.futures.Future: Resolves to the render's result.
+        Raises:
+            ServiceBusy: If the queue is full (and stays full for ``timeout``).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                job = self._jobs.get(key)
+                if job is not None:
+                    return job.future
+                if len(self._queue) < self.max_queue:
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if not block or (remaining is not None and remaining <= 0):
+                    self.rejected += 1
+                    raise ServiceBusy(f"{self.name} queue is full ({self.max_queue} waiting)")
+                self._condition.wait(remaining)
+            job = self._jobs[key] = _Job(key, function, args)
+            self._queue.append(job)
+            self._ensure_workers()
+            self._condition.notify_all()
+        return job.future
+
+    def get(self, key):
+        """Return the future of a render queued or running under ``key``, or None."""
+        with self._condition:
+            job = self._jobs.get(key)
+            return None if job is None else job.future
+
+    def failures(self, key):
+        """Return how many renders under ``key`` have failed in a row."""
+        with self._condition:
+            return self._failures.get(key, 0)
+
+    def position(self, key):
+        """
+        Locate a render.
+        Returns:
+            int: 1-based place in the queue, 0 if it is running, or None if it
+            is neither queued nor running.
+        """
+        with self._condition:
+            job = self._jobs.get(key)
+            if job is None:
+                return None
+            for place, queued in enumerate(self._queue, start=1):
+                if queued is job:
+                    return place
+            return 0
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                job = self._queue.popleft()
+                self.running += 1
+                self._condition.notify_all()  # Room for a blocked submitter
+            if metrics.sampled():
+                metrics.observe(f"{self.name}_queue_wait", time.perf_counter() - job.enqueued_at, page="results")
+            try:
+                with metrics.span(f"{self.name}_render", page="results"):
+                    result = job.function(*job.args)
+            except Exception as error:
+                outcome = False
+                logger.exception("%s render %s failed", self.name, job.key)
+                job.future.set_exception(error)
+            else:
+                outcome = True
+                job.future.set_result(result)
+            with self._condition:
+                self.running -= 1
+                del self._jobs[job.key]
+                if outcome:
+                    self.completed += 1
+                    self._failures.pop(job.key, None)
+                else:
+                    self.failed += 1
+                    self._failures[job.key] = self._failures.pop(job.key, 0) + 1
+                    if len(self._failures) > MAX_FAILED_KEYS:
+                        self._failures.popitem(last=False)
+
+    def stats(self):
+        """
+        Report the service's load.
+        Returns:
+            dict: Queued and running renders, limits, and completed, failed
+            and rejected counts.
+        """
+        with self._condition:
+            return {
+                "queued": len(self._queue),
+                "running": self.running,
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
@@ -0,0 +1,569 @@
+"""PDF rendering of the Data Maturity Assessment report.
+
+Reports are rendered into memory and returned as bytes, so concurrent sessions
+never share a file on disk. The DejaVuSans metrics and the logo are parsed once
+per process and registered on each new document directly, instead of being
+re-read by ``FPDF.add_font`` and ``FPDF.image`` for every report.
+
+Finished reports are memoized in a byte-bounded LRU cache keyed by a hash of the
+report inputs, so identical assessments reuse the same document.
+
+Reports are rendered on the bounded workers of ``render_service``, never on
+Streamlit's script threads. ``prerender_report`` queues a report as soon as the
+assessment is submitted, while the respondent reads the results page; the
+download then takes the cached document, or waits for the render in flight.
+"""
+import hashlib  # For fingerprinting report inputs
+import json  # For canonical serialization of report inputs
+import math  # For the gauge geometry
+import os  # For file path handling
+import threading  # Reports may be rendered from several script threads
+import time  # For the render wait deadline
+from collections import OrderedDict  # For the LRU report cache
+
+from fpdf import FPDF  # For generating PDF reports
+from fpdf.ttfonts import TTFontFile  # For parsing the TrueType font
+
+from charts import GAUGE_BANDS, GAUGE_MAX
+from metrics import metrics
+from render_service import RenderService, ServiceBusy
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FONT_PATH = os.path.join(BASE_DIR, "DejaVuSans.ttf", "ttf", "DejaVuSans.ttf")
+LOGO_PATH = os.path.join(BASE_DIR, "logo_1.png")
+
+# The regular face is registered under every style, as the report has always done
+FONT_STYLES = ("", "B", "I", "BI")
+
+_resource_lock = threading.Lock()
+_font_metrics = None
+_logo_info = None
+
+
+def _load_font_metrics():
+    """Parse DejaVuSans once per process and return its FPDF font description."""
+    global _font_metrics
+    with _resource_lock:
+        if _font_metrics is None:
+            if not os.path.exists(FONT_PATH):
+                raise FileNotFoundError(FONT_PATH)
+            ttf = TTFontFile()
+            ttf.getMetrics(FONT_PATH)
+            _font_metrics = {
+                "name": ttf.fullName.replace(" ", "").replace("(", "").replace(")", ""),
+                "desc": {
+                    "Ascent": int(round(ttf.ascent, 0)),
+                    "Descent": int(round(ttf.descent, 0)),
+                    "CapHeight": int(round(ttf.capHeight, 0)),
+                    "Flags": ttf.flags,
+                    "FontBBox": "[%s %s %s %s]" % tuple(int(round(b, 0)) for b in ttf.bbox),
+                    "ItalicAngle": int(ttf.italicAngle),
+                    "StemV": int(round(ttf.stemV, 0)),
+                    "MissingWidth": int(round(ttf.defaultWidth, 0)),
+                },
+                "up": round(ttf.underlinePosition),
+                "ut": round(ttf.underlineThickness),
+                "cw": ttf.charWidths,
+                "originalsize": os.stat(FONT_PATH).st_size,
+            }
+        return _font_metrics
+
+
+def _load_logo_info():
+    """Parse the report logo once per process and return its FPDF image description."""
+    global _logo_info
+    with _resource_lock:
+        if _logo_info is None:
+            _logo_info = FPDF()._parsepng(LOGO_PATH)
+        return _logo_info
+
+
+def _add_report_fonts(pdf):
+    """
+    Register the cached DejaVuSans family on a document.
+    This mirrors what ``FPDF.add_font(..., uni=True)`` does, minus the parsing.
+    It relies on PyFPDF 1.7.2 internals, as do the logo cache and the gauge
+    drawing: ``fpdf.ttfonts.TTFontFile``, ``FPDF._parsepng``, ``FPDF._out`` and
+    the layout of ``pdf.fonts``, ``pdf.font_files`` and ``pdf.images``. Hence the
+    ``fpdf==1.7.2`` pin in requirements.txt; fpdf2, which installs under the
+    same import name, is not compatible.
+    Args:
+        pdf (FPDF): The document being built.
+    """
+    metrics = _load_font_metrics()
+    for style in FONT_STYLES:
+        fontkey = "dejavusans" + style
+        pdf.fonts[fontkey] = {
+            "i": len(pdf.fonts) + 1, "type": "TTF",
+            "name": metrics["name"], "desc": metrics["desc"],
+            "up": metrics["up"], "ut": metrics["ut"],
+            "cw": metrics["cw"],
+            "ttffile": FONT_PATH, "fontkey": fontkey,
+            "subset": list(range(0, 32)),  # Per-document list of used glyphs
+            "unifilename": None,
+        }
+        pdf.font_files[fontkey] = {"length1": metrics["originalsize"], "type": "TTF", "ttffile": FONT_PATH}
+    pdf.font_files[FONT_PATH] = {"type": "TTF"}
+
+
+def _add_report_logo(pdf):
+    """
+    Register the cached logo on a document so ``pdf.image(LOGO_PATH)`` skips parsing.
+    Args:
+        pdf (FPDF): The document being built.
+    """
+    # FPDF deletes the pixel data from its copy once written, so hand it a shallow copy
+    pdf.images[LOGO_PATH] = dict(_load_logo_info(), i=len(pdf.images) + 1)
+
+
+def _polygon(pdf, points, style="F"):
+    """
+    Paint a closed polygon; FPDF 1.7 has no polygon primitive, so emit the path directly.
+    Args:
+        pdf (FPDF): The document being built.
+        points (list): (x, y) vertices in user units, y pointing down.
+        style (str): "F" to fill, "D" to stroke.
+    """
+    path = " ".join(
+        "%.2f %.2f %s" % (x * pdf.k, (pdf.h - y) * pdf.k, "m" if i == 0 else "l")
+        for i, (x, y) in enumerate(points)
+    )
+    pdf._out(f"{path} h {'f' if style == 'F' else 'S'}")
+
+
+def _draw_gauge(pdf, score, cx, cy, radius, thickness=12):
+    """
+    Draw the maturity score gauge with FPDF vector primitives.
+    The bands and range match the plotly gauge on the results page.
+    Args:
+        pdf (FPDF): The document being built.
+        score (float): Weighted average maturity score.
+        cx (float): Horizontal centre of the gauge, in mm.
+        cy (float): Baseline of the gauge (centre of the half circle), in mm.
+        radius (float): Outer radius, in mm.
+        thickness (float): Width of the coloured band, in mm.
+    """
+    def point(value, r):
+        angle = math.pi * (1 - value / GAUGE_MAX)
+        return cx + r * math.cos(angle), cy - r * math.sin(angle)
+
+    inner = radius - thickness
+    for start, end, rgb in GAUGE_BANDS:
+        steps = max(2, int(24 * (end - start) / GAUGE_MAX) + 1)
+        values = [start + (end - start) * i / steps for i in range(steps + 1)]
+        pdf.set_fill_color(*rgb)
+        _polygon(pdf, [point(v, radius) for v in values] + [point(v, inner) for v in reversed(values)])
+
+    # Tick labels every whole point
+    pdf.set_font("DejaVuSans", size=8)
+    for value in range(GAUGE_MAX + 1):
+        x, y = point(value, radius + 4)
+        label = str(value)
+        pdf.text(x - pdf.get_string_width(label) / 2, y + 1, label)
+
+    # Needle and hub
+    needle_x, needle_y = point(min(max(score, 0), GAUGE_MAX), radius - 2)
+    pdf.set_draw_color(0, 0, 0)
+    pdf.set_line_width(0.8)
+    pdf.line(cx, cy, needle_x, needle_y)
+    pdf.set_fill_color(0, 0, 0)
+    pdf.ellipse(cx - 2, cy - 2, 4, 4, "F")
+    pdf.set_line_width(0.2)  # FPDF's default
+
+    # Score under the hub
+    pdf.set_font("DejaVuSans", "B", 14)
+    label = f"{score:.2f} / {GAUGE_MAX}"
+    pdf.text(cx - pdf.get_string_width(label) / 2, cy + 9, label)
+
+
+def missing_assets():
+    """
+    List the report assets missing on disk.
+    Returns:
+        list: File names of the missing font and logo files.
+    """
+    return [os.path.basename(path) for path in (FONT_PATH, LOGO_PATH) if not os.path.exists(path)]
+
+
+def warm_up():
+    """Load the font and the logo ahead of the first report."""
+    _load_font_metrics()
+    _load_logo_info()
+
+
+def generate_pdf_report(maturity_level, weighted_avg_score, recommendation, weighted_scores, insights, current_capabilities, recommendations, roadmap, score_band=None, prepared_for=None):
+    """
+    Render the Data Maturity Assessment report entirely in memory.
+    Args:
+        maturity_level (scoring.MaturityLevel): The respondent's maturity level.
+        weighted_avg_score (float): Weighted average maturity score (1-5).
+        recommendation (str): Headline recommendation for the maturity level.
+        weighted_scores (dict): Weighted score per category.
+        insights (list): AI-driven insights.Insight objects.
+        current_capabilities (dict): Analytics capabilities at the current level.
+        recommendations (dict): Recommendations and next steps for the level.
+        roadmap (dict): Analytics capabilities of the other maturity levels.
+        score_band (confidence.ScoreBand): Optional confidence interval of the
+            score and probability of each maturity level.
+        prepared_for (str): Optional respondent line printed under the title.
+            Personalized reports must not go through report_cache.
+    Returns:
+        bytes: The finished PDF document.
+    Raises:
+        FileNotFoundError: If the font or the logo file is missing.
+    """
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Register the DejaVuSans family from the per-process font cache
+    _add_report_fonts(pdf)
+
+    # Set the default font to regular
+    pdf.set_font("DejaVuSans", size=12)
+
+    # Add the logo from the per-process image cache (no temporary files)
+    _add_report_logo(pdf)
+    pdf.image(LOGO_PATH, x=50, w=100)  # Center the logo and set width to 100
+    pdf.ln(20)  # Add some space after the logo
+
+    # Add title
+    pdf.set_font("DejaVuSans", "B", 16)  # Bold and larger font for the title
+    pdf.cell(200, 10, txt="The Virtual Narrative: Data Maturity Assessment Report", ln=True, align="C")
+    if prepared_for:
+        pdf.set_font("DejaVuSans", size=12)
+        pdf.cell(200, 10, txt=f"Prepared for {prepared_for}", ln=True, align="C")
+    pdf.ln(10)  # Add some space after the title
+
+    # Add the introduction paragraph
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    intro_text = """
+    In today’s rapidly evolving digital world, data is not just an asset; it's the backbone of decision-making, strategy, and innovation. Understanding the maturity of your data practices is key to unlocking its full potential. The concept of Data Maturity reflects how well an organization manages, integrates, analyzes, and secures its data. It’s a journey that takes an organization from basic, reactive data handling to a sophisticated, proactive approach where data is seamlessly integrated into decision-making processes.
+
+    The journey through data maturity is often divided into five stages:
+    - Initial/Ad Hoc: Where data processes are disjointed and unpredictable.
+    - Developing: Where basic processes are established but still lack consistency.
+    - Defined: Where standard processes are in place, and data is beginning to drive decisions.
+    - Managed: Where data management is more structured, automated, and fully integrated into business processes.
+    - Optimized: Where data is fully embedded in decision-making, and advanced analytics and AI continuously improve business outcomes.
+
+    Each stage reflects an organization's growing ability to leverage data to gain insights, optimize operations, and drive innovation. In this assessment, we’ll evaluate where your organization stands on this maturity journey and provide actionable insights to help you advance.
+
+    Now, let’s see where your organization’s data maturity currently stands with the Data Maturity Score, as visualized below in the gauge chart.
+    """
+    pdf.multi_cell(200, 10, txt=intro_text.replace("’", "'"), align="L")
+    pdf.ln(10)  # Add some space after the introduction
+
+    # Add maturity level and score
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for section titles
+    pdf.cell(200, 10, txt="Maturity Level and Score", ln=True)
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    pdf.cell(200, 10, txt=f"Your organization's data maturity level is: {maturity_level.label}", ln=True)
+    pdf.cell(200, 10, txt=f"Weighted Average Maturity Score: {weighted_avg_score:.2f}/5", ln=True)
+    if score_band is not None:
+        pdf.cell(200, 10, txt=f"{score_band.confidence:.0%} Confidence Range: {score_band.low:.2f}-{score_band.high:.2f}", ln=True)
+        likely = ", ".join(f"{level.label} {probability:.0%}" for level, probability in score_band.likely_levels())
+        pdf.cell(200, 10, txt=f"Likely Maturity Levels: {likely}", ln=True)
+    pdf.cell(200, 10, txt=f"Recommendation: {recommendation}", ln=True)
+
+    # Add the gauge chart, drawn as vector graphics (no image rendering needed)
+    gauge_height = 60
+    if pdf.get_y() + gauge_height > pdf.page_break_trigger:
+        pdf.add_page()
+    gauge_top = pdf.get_y() + 5
+    _draw_gauge(pdf, weighted_avg_score, cx=pdf.w / 2, cy=gauge_top + 45, radius=40)
+    pdf.set_y(gauge_top + gauge_height)
+    pdf.set_font("DejaVuSans", size=12)  # Restore the content font
+    pdf.ln(10)  # Add some space after the section
+
+    # Add weighted scores breakdown
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for section titles
+    pdf.cell(200, 10, txt="Breakdown by Category (Weighted Scores)", ln=True)
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    for category, score in weighted_scores.items():
+        pdf.cell(200, 10, txt=f"{category}: {score:.2f}/5", ln=True)
+    pdf.ln(10)  # Add some space after the section
+
+    # Add AI-driven insights
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for section titles
+    pdf.cell(200, 10, txt="AI-Driven Insights", ln=True)
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    for insight in insights:
+        pdf.multi_cell(200, 10, txt=f"- {insight.text}", align="L")
+    pdf.ln(10)  # Add some space after the section
+
+    # Add current analytics capabilities with dynamic color
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for section titles
+    pdf.set_text_color(*maturity_level.colour)
+    pdf.cell(200, 10, txt="Current Analytics Capabilities", ln=True)
+    pdf.set_text_color(0, 0, 0)  # Reset to black
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    for capability in current_capabilities["capabilities"]:
+        # Split the capability into type and description
+        capability_type, capability_desc = capability.split(":", 1)
+        pdf.set_font("DejaVuSans", "B", 12)  # Bold for capability type
+        pdf.cell(200, 10, txt=f"- {capability_type}:", ln=True)
+        pdf.set_font("DejaVuSans", size=12)  # Regular font for description
+        pdf.multi_cell(200, 10, txt=f"  {capability_desc.strip()}", align="L")
+    pdf.cell(200, 10, txt=f"Example: {current_capabilities['example']}", ln=True)
+    pdf.ln(10)  # Add some space after the section
+
+    # Add dynamic recommendations
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for section titles
+    pdf.cell(200, 10, txt="Recommendations for Improvement", ln=True)
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    for rec in recommendations["recommendations"]:
+        pdf.multi_cell(200, 10, txt=f"- {rec}", align="L")
+    pdf.set_font("DejaVuSans", "B", 12)  # Bold for subheadings
+    pdf.cell(200, 10, txt="Next Steps:", ln=True)
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    for step in recommendations["next_steps"]:
+        pdf.multi_cell(200, 10, txt=f"- {step}", align="L")
+    pdf.ln(10)  # Add some space after the section
+
+    # Add roadmap
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for section titles
+    pdf.cell(200, 10, txt="Roadmap to Higher Maturity Levels", ln=True)
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    for stage, details in roadmap.items():
+        pdf.set_font("DejaVuSans", "B", 12)  # Bold for subheadings
+        pdf.cell(200, 10, txt=f"{stage}:", ln=True)
+        pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+        for capability in details["capabilities"]:
+            # Split the capability into type and description
+            capability_type, capability_desc = capability.split(":", 1)
+            pdf.set_font("DejaVuSans", "B", 12)  # Bold for capability type
+            pdf.cell(200, 10, txt=f"- {capability_type}:", ln=True)
+            pdf.set_font("DejaVuSans", size=12)  # Regular font for description
+            pdf.multi_cell(200, 10, txt=f"  {capability_desc.strip()}", align="L")
+        pdf.cell(200, 10, txt=f"Example: {details['example']}", ln=True)
+    pdf.ln(10)  # Add some space after the section
+
+    # Add a concluding note
+    pdf.set_font("DejaVuSans", "I", 12)  # Italic for the concluding note
+    pdf.cell(200, 10, txt="Thank you for using The Virtual Narrative: Data Maturity Assessment Tool!", ln=True, align="C")
+    pdf.ln(10)  # Add some space after the note
+
+    # Add a creative call to action
+    pdf.set_font("DejaVuSans", "B", 14)  # Bold for the call to action
+    pdf.set_text_color(0, 0, 255)  # Blue for emphasis
+    pdf.cell(200, 10, txt="Need a Helping Hand Across the Chasm to Data Maturity?", ln=True, align="C")
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    pdf.set_text_color(0, 0, 0)  # Reset to black
+    pdf.cell(200, 10, txt="Embarking on the journey to data maturity can be challenging, but you don't have to do it alone.", ln=True, align="C")
+    pdf.cell(200, 10, txt="Reach out to us for expert guidance and support:", ln=True, align="C")
+    pdf.set_font("DejaVuSans", "B", 12)  # Bold for contact details
+    pdf.cell(200, 10, txt="Virtual Analytics", ln=True, align="C")
+    pdf.cell(200, 10, txt="www.virtualanalytics.co.ke | info@virtualanalytics.co.ke", ln=True, align="C")
+    pdf.set_font("DejaVuSans", size=12)  # Regular font for content
+    pdf.cell(200, 10, txt="Let us help you unlock the full potential of your data!", ln=True, align="C")
+
+    # Return the PDF as bytes; FPDF 1.7 builds the document as a latin-1 string
+    return pdf.output(dest="S").encode("latin-1")
+
+
+def report_fingerprint(maturity_level, weighted_avg_score, recommendation, weighted_scores, insights, current_capabilities, recommendations, roadmap, score_band=None):
+    """
+    Hash the inputs of generate_pdf_report into a cache key.
+    Only the assessment outcome is hashed; the respondent's personal details are
+    not part of the report inputs and must never be added here.
+    Returns:
+        str: Hex SHA-256 digest of the canonical JSON encoding of the inputs.
+    """
+    inputs = [maturity_level, round(weighted_avg_score, 6), recommendation,
+              {category: round(score, 6) for category, score in weighted_scores.items()},
+              insights, current_capabilities, recommendations, roadmap]
+    if score_band is not None:  # Reports without a band keep their earlier keys
+        inputs.append([round(score_band.low, 6), round(score_band.high, 6), score_band.confidence,
+                       [round(probability, 6) for probability in score_band.level_probabilities]])
+    payload = json.dumps(
+        inputs,
+        sort_keys=True, ensure_ascii=False, separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """
+    Thread-safe LRU cache of finished PDF reports, bounded by total size.
+    Args:
+        max_bytes (int): Byte budget; least recently used reports are evicted
+            once the cached documents exceed it.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._reports = OrderedDict()  # fingerprint -> PDF bytes
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._reports
+
+    def get(self, key):
+        """Return the cached report for a fingerprint, or None."""
+        with self._lock:
+            pdf_bytes = self._reports.get(key)
+            if pdf_bytes is None:
+                self.misses += 1
+                return None
+            self._reports.move_to_end(key)
+            self.hits += 1
+            return pdf_bytes
+
+    def put(self, key, pdf_bytes):
+        """Store a report, evicting the least recently used ones over budget."""
+        if len(pdf_bytes) > self.max_bytes:
+            return  # Never worth flushing the whole cache for one document
+        with self._lock:
+            previous = self._reports.pop(key, None)
+            if previous is not None:
+                self.size -= len(previous)
+            self._reports[key] = pdf_bytes
+            self.size += len(pdf_bytes)
+            while self.size > self.max_bytes:
+                _, evicted = self._reports.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every cached report and reset the counters."""
+        with self._lock:
+            self._reports.clear()
+            self.size = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Report cache usage.
+        Returns:
+            dict: Entry count, bytes used and budget, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._reports),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# ✅ Shared report cache, sized by VN_REPORT_CACHE_MB (default 64 MB)
+report_cache = ReportCache(max_bytes=int(float(os.environ.get("VN_REPORT_CACHE_MB", "64")) * 1024 * 1024))
+
+
+# ✅ Shared render service: VN_REPORT_WORKERS renders at once (default 2), VN_REPORT_QUEUE waiting (default 32)
+render_service = RenderService(
+    workers=int(os.environ.get("VN_REPORT_WORKERS", "2")),
+    max_queue=int(os.environ.get("VN_REPORT_QUEUE", "32")),
+    name="pdf",
+)
+metrics.register_gauge("vn_report_queue_length", "PDF reports waiting for a render worker.", lambda: render_service.stats()["queued"])
+metrics.register_gauge("vn_report_renders_running", "PDF reports being rendered.", lambda: render_service.stats()["running"])
+metrics.register_gauge("vn_report_rejected_total", "PDF renders refused because the queue was full.", lambda: render_service.stats()["rejected"], kind="counter")
+
+
+# Background renders of one report allowed to fail before it is reported as failed
+REPORT_MAX_ATTEMPTS = 2
+
+
+def _render_and_cache(key, args):
+    """Render one report on a render worker and cache it."""
+    pdf_bytes = generate_pdf_report(*args)
+    report_cache.put(key, pdf_bytes)  # Before the job leaves the service, so get_pdf_report always finds one
+    return pdf_bytes
+
+
+def prerender_report(*args, fingerprint=None):
+    """
+    Queue a report render unless the report is cached or already queued; the
+    service being full is not an error here, the report is simply not started.
+    Args:
+        fingerprint (str): report_fingerprint of the arguments, when already known.
+    Returns:
+        concurrent.futures.Future: The render queued or running, or None if the
+        report is cached, has failed REPORT_MAX_ATTEMPTS times, or the queue
+        is full.
+    """
+    key = fingerprint or report_fingerprint(*args)
+    if key in report_cache or render_service.failures(key) >= REPORT_MAX_ATTEMPTS:
+        return None
+    try:
+        return render_service.submit(key, _render_and_cache, key, args)
+    except ServiceBusy:
+        return None
+
+
+def report_status(fingerprint):
+    """
+    Describe where a report is.
+    Args:
+        fingerprint (str): report_fingerprint of the report arguments.
+    Returns:
+        tuple: ("queued", place in the queue), ("rendering", 0), ("ready", 0),
+        ("failed", failed renders) once it has failed REPORT_MAX_ATTEMPTS
+        times, or ("missing", 0) when it was never queued or has been evicted.
+    """
+    position = render_service.position(fingerprint)
+    if position:
+        return "queued", position
+    if position == 0:
+        return "rendering", 0
+    if fingerprint in report_cache:
+        return "ready", 0
+    failures = render_service.failures(fingerprint)
+    if failures >= REPORT_MAX_ATTEMPTS:
+        return "failed", failures
+    return "missing", 0
+
+
+def get_pdf_report(*args, fingerprint=None, timeout=None):
+    """
+    Return the PDF report for the given generate_pdf_report arguments: from the
+    cache, or from the render service, waiting for a render queued or running
+    (one is queued if needed). Reports are never rendered on the caller's
+    thread. Only anonymous reports are cached, so ``prepared_for`` is not
+    accepted here.
+    Args:
+        fingerprint (str): report_fingerprint of the arguments, when already
+            known (results.ResultSnapshot carries it).
+        timeout (float): Longest wait, for room in the queue and then for the
+            render, in seconds; None waits as long as it takes.
+    Returns:
+        bytes: The finished PDF document.
+    Raises:
+        ServiceBusy: If the queue stayed full for ``timeout``.
+        concurrent.futures.TimeoutError: If the render did not finish in time.
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    key = fingerprint or report_fingerprint(*args)
+    job = render_service.get(key)  # Checked before the cache: a finishing job caches, then leaves
+    if job is None:
+        pdf_bytes = report_cache.get(key)
+        if pdf_bytes is not None:
+            return pdf_bytes
+        job = render_service.submit(key, _render_and_cache, key, args, block=True, timeout=timeout)
+    return job.result(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+
+def render_report_directly(*args, fingerprint=None):
+    """
+    Render a report on the caller's thread, bypassing the render service; the
+    fallback offered once background renders of the report have failed.
+    Args:
+        fingerprint (str): report_fingerprint of the arguments, when already known.
+    Returns:
+        bytes: The finished PDF document, also cached.
+    Raises:
+        Exception: Whatever generate_pdf_report raises.
+    """
+    key = fingerprint or report_fingerprint(*args)
+    with metrics.span("pdf_direct_render", page="results"):
+        pdf_bytes = generate_pdf_report(*args)
+    report_cache.put(key, pdf_bytes)
+    return pdf_bytes
@@ -0,0 +1,272 @@
+"""Persistent, non-blocking store for completed assessments.
+
+Submissions are appended to a local SQLite database in WAL mode. The script
+thread only puts the record on an in-memory queue; a background writer thread
+drains the queue and commits records in batches, so respondents never wait on
+disk I/O. The queue is flushed when the process exits.
+
+Listeners registered with ``add_listener`` are called by the writer with each
+batch inside the transaction that stores it, so derived tables (such as the
+cohort aggregates) stay consistent with the submissions. When that transaction
+is rolled back, their ``on_rollback`` callable is told to drop any in-memory
+state it had already updated.
+
+A record that cannot be stored (missing answers, values JSON cannot encode) is
+logged, counted as rejected and skipped; the rest of its batch is written. A
+batch whose transaction fails is logged and retried one record at a time, so
+one bad write never costs the other submissions, and the writer thread keeps
+running whatever happens.
+
+The database path defaults to ``responses.db`` next to this file and can be
+changed with the ``VN_RESPONSE_DB`` environment variable.
+"""
+import atexit  # For flushing on shutdown
+import json  # For storing answers and weights
+import logging  # For records and batches that could not be written
+import os  # For the database path
+import queue  # For handing records to the writer thread
+import sqlite3  # For the append-only store
+import threading  # For the background writer
+import time  # For timestamps and throughput
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.environ.get("VN_RESPONSE_DB", os.path.join(BASE_DIR, "responses.db"))
+
+# Respondent fields stored as plain columns, in the order of the user info page
+USER_FIELDS = ("first_name", "last_name", "email", "org_name", "business_unit")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    submitted_at REAL NOT NULL,
+    first_name TEXT,
+    last_name TEXT,
+    email TEXT,
+    org_name TEXT,
+    business_unit TEXT,
+    answers TEXT NOT NULL,
+    priorities TEXT,
+    weights TEXT NOT NULL
+)
+"""
+
+_INSERT = (
+    "INSERT INTO submissions (submitted_at, first_name, last_name, email, org_name, business_unit, answers, priorities, weights) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_STOP = object()  # Queue sentinel asking the writer to exit
+
+logger = logging.getLogger(__name__)
+
+
+def connect(path=DEFAULT_DB_PATH):
+    """
+    Open a connection to the store, creating the schema if needed.
+    Args:
+        path (str): Database file.
+    Returns:
+        sqlite3.Connection: Connection in WAL mode.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")  # Durable enough with WAL, far fewer fsyncs
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def _row(record):
+    """Flatten a submission record into an INSERT parameter tuple."""
+    return (
+        record.get("submitted_at", time.time()),
+        *(record.get(field) for field in USER_FIELDS),
+        json.dumps(record["answers"], separators=(",", ":")),
+        json.dumps(record.get("priorities"), separators=(",", ":")),
+        json.dumps(record["weights"], separators=(",", ":")),
+    )
+
+
+class ResponseStore:
+    """
+    Write-behind store: submit() enqueues, a daemon thread commits in batches.
+    Args:
+        path (str): Database file.
+        batch_size (int): Maximum records committed per transaction.
+        flush_interval (float): Seconds the writer waits for more records
+            before committing a partial batch.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=200, flush_interval=0.5):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+        self.errors = 0
+        self.rejected = 0
+        self.listener_errors = 0
+        self.started_at = None
+        self._listeners = []
+        self._atexit_registered = False
+
+    def _ensure_writer(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():  # Also replaces a writer that died
+                if self._thread is None:
+                    self.started_at = time.monotonic()
+                self._thread = threading.Thread(target=self._run, name="response-store-writer", daemon=True)
+                self._thread.start()
+                if not self._atexit_registered:
+                    self._atexit_registered = True
+                    atexit.register(self.close)
+
+    def add_listener(self, listener, on_rollback=None):
+        """
+        Register a callable run by the writer for every committed batch.
+        Args:
+            listener (callable): Called as ``listener(connection, records)``
+                inside the batch's transaction; adding the same listener twice
+                has no effect.
+            on_rollback (callable): Called without arguments when a transaction
+                the listener took part in is rolled back.
+        """
+        with self._lock:
+            if all(listener != registered for registered, _ in self._listeners):
+                self._listeners.append((listener, on_rollback))
+
+    def submit(self, record):
+        """
+        Queue a completed assessment for writing and return immediately.
+        Args:
+            record (dict): USER_FIELDS, ``answers`` (question key to score),
+                ``priorities`` (weighting question key to score) and ``weights``
+                (section title to weight).
+        """
+        self._ensure_writer()
+        self._queue.put(dict(record, submitted_at=record.get("submitted_at", time.time())))
+
+    def _run(self):
+        connection = connect(self.path)
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        self._queue.task_done()
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                if batch:
+                    self._write(connection, batch)
+        finally:
+            connection.close()
+
+    def _commit(self, connection, records, rows):
+        """Insert rows and run the listeners in one transaction; raises sqlite3.Error."""
+        listeners = list(self._listeners)
+        try:
+            with connection:
+                connection.executemany(_INSERT, rows)
+                for listener, _ in listeners:
+                    try:
+                        listener(connection, records)
+                    except sqlite3.Error:
+                        raise
+                    except Exception:
+                        self.listener_errors += 1  # Never lose submissions to a listener bug
+                        logger.exception("Response store listener %r failed", listener)
+        except sqlite3.Error:
+            for _, on_rollback in listeners:
+                if on_rollback is not None:
+                    on_rollback()
+            raise
+
+    def _write(self, connection, batch):
+        start = time.perf_counter()
+        try:
+            records, rows = [], []
+            for record in batch:
+                try:
+                    rows.append(_row(record))
+                except Exception:
+                    self.rejected += 1
+                    logger.exception("Skipped a submission that cannot be stored")
+                else:
+                    records.append(record)
+            if not records:
+                return
+            try:
+                self._commit(connection, records, rows)
+            except sqlite3.Error:
+                logger.exception("Writing a batch of %d submissions failed; retrying them one at a time", len(records))
+            else:
+                self.written += len(records)
+                self.batches += 1
+                return
+            for record, row in zip(records, rows):
+                try:
+                    self._commit(connection, [record], [row])
+                except sqlite3.Error:
+                    self.errors += 1
+                    logger.exception("Writing a submission failed")
+                else:
+                    self.written += 1
+                    self.batches += 1
+        except Exception:  # Keep the writer alive: flush() and close() wait on it
+            self.errors += 1
+            logger.exception("Response store writer failed on a batch")
+        finally:
+            self.write_seconds += time.perf_counter() - start
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self):
+        """Block until every queued record has been committed."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Flush the queue and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join()
+
+    def stats(self):
+        """
+        Report writer activity.
+        Returns:
+            dict: Records written, batches, errors (of writes and of listeners),
+            records rejected as unstorable,
+            queue depth, and throughput both per second of write time and per
+            second since the writer started.
+        """
+        uptime = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            "written": self.written,
+            "batches": self.batches,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "listener_errors": self.listener_errors,
+            "queue_depth": self._queue.qsize(),
+            "write_rows_per_second": self.written / self.write_seconds if self.write_seconds else 0.0,
+            "rows_per_second": self.written / uptime if uptime else 0.0,
+        }
+
+
+# ✅ Shared store used by every session of the app
+response_store = ResponseStore()
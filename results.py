@@ -0,0 +1,96 @@
+"""Frozen assessment results, computed once when the assessment is submitted.
+
+The results page reruns on every interaction, including the click on "Download
+PDF Report". Instead of rescoring the answers each time, the whole report model
+(scores, maturity level, confidence band, insights, stage content, peer
+comparison and the report cache key) is built once when the last section is submitted and kept in the
+session as a ResultSnapshot. The results page and the PDF export both render
+from that snapshot only, so they always show the same outcome.
+"""
+from typing import NamedTuple
+
+from confidence import ScoreBand, score_band
+from insights import analytics_capabilities, dynamic_recommendations, generate_ai_insights, question_scores
+from peers import peer_percentiles
+from scoring import MATURITY_RECOMMENDATIONS, MATURITY_LEVELS, SECTION_TITLES, answer_scores, priority_scores, score_assessment, split_answers
+
+
+class FrozenDict(dict):
+    """A dict that refuses changes; still a dict for JSON encoding and pickling."""
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("result snapshots are read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def __reduce__(self):
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value):
+    """Recursively turn dicts into FrozenDicts and lists into tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)) and not hasattr(value, "_fields"):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+class ResultSnapshot(NamedTuple):
+    """Everything the results page and the PDF report show."""
+    maturity_level: object  # scoring.MaturityLevel
+    weighted_avg_score: float
+    recommendation: str
+    section_scores: FrozenDict  # Unweighted score per section title
+    weighted_scores: FrozenDict  # Weighted score per section title
+    insights: tuple  # insights.Insight objects
+    current_capabilities: FrozenDict  # Analytics capabilities at the maturity level
+    recommendations: FrozenDict  # Recommendations and next steps for the level
+    roadmap: FrozenDict  # Analytics capabilities of the other levels
+    peer_shares: FrozenDict  # Top share per metric; empty with too few peers
+    score_band: ScoreBand  # Confidence interval of the score and level probabilities
+    fingerprint: str  # report.report_fingerprint of the report arguments
+
+    def report_arguments(self):
+        """
+        Positional arguments for report.generate_pdf_report.
+        Returns:
+            tuple: Arguments rendering exactly this snapshot.
+        """
+        return (self.maturity_level, self.weighted_avg_score, self.recommendation, self.weighted_scores,
+                self.insights, self.current_capabilities, self.recommendations, self.roadmap, self.score_band)
+
+
+def build_snapshot(answers, weights):
+    """
+    Score a completed assessment and freeze the report model.
+    Args:
+        answers (bytes): The session's answer vector (questionnaire.new_answers).
+        weights (np.ndarray): (sections,) section weights.
+    Returns:
+        ResultSnapshot: The frozen results.
+    """
+    from report import report_fingerprint  # Imported on first use; pulls in fpdf
+
+    priority_indices, option_indices = split_answers(answers)
+    answer_matrix = answer_scores(option_indices)
+    scores = score_assessment(answer_matrix, weights)
+    section_scores = dict(zip(SECTION_TITLES, scores.section_scores.tolist()))
+    weighted_avg_score = float(scores.overall)
+    maturity_level = MATURITY_LEVELS[int(scores.level)]
+    snapshot = ResultSnapshot(
+        maturity_level=maturity_level,
+        weighted_avg_score=weighted_avg_score,
+        recommendation=MATURITY_RECOMMENDATIONS[maturity_level.index],
+        section_scores=freeze(section_scores),
+        weighted_scores=freeze(dict(zip(SECTION_TITLES, scores.weighted_scores.tolist()))),
+        insights=tuple(generate_ai_insights(section_scores, question_scores(answer_matrix))),
+        current_capabilities=freeze(analytics_capabilities[maturity_level.label]),
+        recommendations=freeze(dynamic_recommendations[maturity_level.label]),
+        roadmap=freeze({stage: details for stage, details in analytics_capabilities.items() if stage != maturity_level.label}),
+        peer_shares=freeze(peer_percentiles.compare(weighted_avg_score, section_scores)),
+        score_band=score_band(answer_matrix, priority_scores(priority_indices)),
+        fingerprint="",
+    )
+    return snapshot._replace(fingerprint=report_fingerprint(*snapshot.report_arguments()))
@@ -0,0 +1,183 @@
+"""Vectorized scoring engine for the Data Maturity Assessment.
+
+Answers are held as a sections x questions integer matrix of option scores (1-5)
+and weights as one weight per section. Every function also accepts a stack of
+respondents, i.e. arrays with extra leading dimensions, so the same code path
+scores a single interactive session and a whole cohort in one NumPy operation.
+"""
+import functools  # For adding up question columns
+from typing import NamedTuple
+
+import numpy as np
+
+from questionnaire import ANSWER_SLOTS, SECTIONS, WEIGHTING_QUESTIONS
+
+SECTION_TITLES = tuple(section.title for section in SECTIONS)
+QUESTIONS_PER_SECTION = max(len(section.questions) for section in SECTIONS)
+
+# Number of questions in each section, used to average over padded matrices
+_QUESTION_COUNTS = np.array([len(section.questions) for section in SECTIONS], dtype=np.int64)
+
+
+def _score_table(questions_by_row, width):
+    """Build a rows x width x options table of option scores, zero-padded."""
+    options = max(len(question.scores) for row in questions_by_row for question in row)
+    table = np.zeros((len(questions_by_row), width, options), dtype=np.int64)
+    for row, questions in enumerate(questions_by_row):
+        for column, question in enumerate(questions):
+            table[row, column, :len(question.scores)] = question.scores
+    return table
+
+
+# Score of every option of every section question, and of the weighting questions
+SCORE_TABLE = _score_table([section.questions for section in SECTIONS], QUESTIONS_PER_SECTION)
+PRIORITY_TABLE = _score_table([WEIGHTING_QUESTIONS], len(WEIGHTING_QUESTIONS))[0]
+
+# Answer vector slot of every section question and weighting question; SECTION_MASK
+# (read-only) is True where a section has a question and False on padding slots
+_SECTION_SLOTS = np.zeros((len(SECTIONS), QUESTIONS_PER_SECTION), dtype=np.int64)
+SECTION_MASK = np.zeros((len(SECTIONS), QUESTIONS_PER_SECTION), dtype=bool)
+for _row, _section in enumerate(SECTIONS):
+    for _column, _question in enumerate(_section.questions):
+        _SECTION_SLOTS[_row, _column] = ANSWER_SLOTS[_question.key]
+        SECTION_MASK[_row, _column] = True
+del _row, _section, _column, _question
+SECTION_MASK.flags.writeable = False
+_PRIORITY_SLOTS = np.array([ANSWER_SLOTS[question.key] for question in WEIGHTING_QUESTIONS], dtype=np.int64)
+
+
+class MaturityLevel(NamedTuple):
+    """One of the five maturity stages."""
+    index: int  # Position in MATURITY_LEVELS, as returned by maturity_level_index
+    key: str  # Stable identifier, e.g. "defined"
+    label: str  # Stage name, also the key of its analytics capabilities and recommendations
+    emoji: str  # Marker shown next to the label on screen
+    colour: tuple  # RGB, shared by the gauge band and the PDF headings
+
+    @property
+    def title(self):
+        """Label with its emoji marker, e.g. "🟡 Defined"."""
+        return f"{self.emoji} {self.label}"
+
+
+# ✅ Maturity bands: a score up to and including each threshold falls in that band
+MATURITY_THRESHOLDS = np.array([1.5, 2.5, 3.5, 4.5])
+MATURITY_LEVELS = (
+    MaturityLevel(0, "initial", "Initial/Ad Hoc", "🔴", (255, 0, 0)),
+    MaturityLevel(1, "developing", "Developing", "🟠", (255, 165, 0)),
+    MaturityLevel(2, "defined", "Defined", "🟡", (255, 255, 0)),
+    MaturityLevel(3, "managed", "Managed", "🟢", (0, 128, 0)),
+    MaturityLevel(4, "optimized", "Optimized", "🔵", (0, 0, 255)),
+)
+MATURITY_STAGES = tuple(level.label for level in MATURITY_LEVELS)  # Labels without the emoji
+MATURITY_RECOMMENDATIONS = (
+    "You are at the beginning point for Data Management. Start by defining data governance policies and improving data quality.",
+    "You have basic policies but lack consistency. Focus on standardizing processes and improving data integration.",
+    "You have structured processes, but there is room for more automation and real-time analytics.",
+    "Your organization has well-established data governance. Continue refining automation and advanced analytics adoption.",
+    "Your organization is at the highest level of data maturity! Continue leveraging AI-driven insights for optimization.",
+)
+
+
+class Scores(NamedTuple):
+    """Scores of one respondent, or of a stack of respondents."""
+    section_scores: np.ndarray  # (..., sections) mean answer score per section
+    weighted_scores: np.ndarray  # (..., sections) section score times its weight
+    overall: np.ndarray  # (...,) weighted average maturity score
+    level: np.ndarray  # (...,) index into MATURITY_LEVELS
+
+
+def split_answers(answers):
+    """
+    Split answer vectors (see questionnaire.new_answers) into the option
+    indices of the weighting page and of the section questions.
+    Args:
+        answers (bytes-like or array-like): (..., slots) option indices.
+    Returns:
+        tuple: (..., sections) weighting option indices and
+        (..., sections, questions) section option indices.
+    """
+    if isinstance(answers, (bytes, bytearray)):
+        answers = np.frombuffer(answers, dtype=np.uint8)
+    answers = np.asarray(answers, dtype=np.int64)
+    return answers[..., _PRIORITY_SLOTS], np.where(SECTION_MASK, answers[..., _SECTION_SLOTS], 0)
+
+
+def answer_scores(option_indices):
+    """
+    Map selected option indices to their scores.
+    Args:
+        option_indices (array-like): (..., sections, questions) option indices.
+    Returns:
+        np.ndarray: (..., sections, questions) option scores.
+    """
+    option_indices = np.asarray(option_indices, dtype=np.int64)
+    rows = np.arange(len(SECTIONS))[:, None]
+    columns = np.arange(QUESTIONS_PER_SECTION)[None, :]
+    return SCORE_TABLE[rows, columns, option_indices]
+
+
+def priority_scores(option_indices):
+    """
+    Map the option indices selected on the weighting page to priority scores.
+    Args:
+        option_indices (array-like): (..., sections) option indices.
+    Returns:
+        np.ndarray: (..., sections) priority scores.
+    """
+    option_indices = np.asarray(option_indices, dtype=np.int64)
+    return PRIORITY_TABLE[np.arange(len(WEIGHTING_QUESTIONS)), option_indices]
+
+
+def weights_from_priorities(priorities):
+    """
+    Turn priority scores into section weights that sum to one.
+    Args:
+        priorities (array-like): (..., sections) priority scores.
+    Returns:
+        np.ndarray: (..., sections) section weights.
+    """
+    priorities = np.asarray(priorities, dtype=np.float64)
+    return priorities / priorities.sum(axis=-1, keepdims=True)
+
+
+def weights_vector(weights):
+    """
+    Convert a weights dict, keyed by section title, to an array in section order.
+    Args:
+        weights (dict): Weight per section title.
+    Returns:
+        np.ndarray: (sections,) section weights.
+    """
+    return np.array([weights[title] for title in SECTION_TITLES], dtype=np.float64)
+
+
+def maturity_level_index(overall):
+    """
+    Find the maturity band of one or more weighted average scores.
+    Args:
+        overall (array-like): Weighted average maturity scores.
+    Returns:
+        np.ndarray: Indices into MATURITY_LEVELS.
+    """
+    return np.searchsorted(MATURITY_THRESHOLDS, overall, side="left")
+
+
+def score_assessment(answers, weights):
+    """
+    Score one or more assessments.
+    Args:
+        answers (array-like): (..., sections, questions) answer scores; unused
+            question slots of shorter sections must be zero.
+        weights (array-like): (..., sections) section weights, broadcastable
+            against the answers' leading dimensions.
+    Returns:
+        Scores: Section, weighted and overall scores and the maturity band.
+    """
+    answers = np.asarray(answers, dtype=np.float64)
+    weights = np.asarray(weights, dtype=np.float64)
+    # Adding up the question columns gives the same sums as sum(axis=-1), several times faster over so short an axis
+    section_scores = functools.reduce(np.add, np.moveaxis(answers, -1, 0)) / _QUESTION_COUNTS
+    weighted_scores = section_scores * weights
+    overall = weighted_scores.sum(axis=-1)
+    return Scores(section_scores, weighted_scores, overall, maturity_level_index(overall))
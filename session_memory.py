@@ -0,0 +1,106 @@
+"""Per-session memory accounting for the admin view.
+
+Every Streamlit session keeps its session state in server memory for as long
+as the session lives, including while the browser tab sits idle. The script
+records the deep size of its session state after each full run, keyed by
+session id, so an administrator can see the average and largest session and
+how many sessions are being held.
+"""
+import sys  # For object sizes
+import threading  # Sessions run on separate script threads
+import time  # For last-update timestamps
+
+# Containers whose contents are counted towards their size
+_CONTAINERS = (dict, list, tuple, set, frozenset)
+
+
+def deep_sizeof(obj, seen=None):
+    """
+    Estimate the memory held by an object and everything it contains.
+    Args:
+        obj: The object to measure.
+        seen (set): Ids of objects already counted, so shared objects are
+            counted once.
+    Returns:
+        int: Size in bytes.
+    """
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(key, seen) + deep_sizeof(value, seen) for key, value in obj.items())
+    elif isinstance(obj, _CONTAINERS):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    return size
+
+
+def _session_exists(session_id):
+    """True unless the Streamlit runtime reports the session as gone."""
+    try:
+        from streamlit import runtime
+
+        if not runtime.exists():
+            return True
+        return runtime.get_instance()._session_mgr.get_session_info(session_id) is not None
+    except Exception:
+        return True  # Keep the figure rather than lose it to an internal API change
+
+
+class SessionMemory:
+    """
+    Last measured session state size of every live session.
+    Args:
+        exists (callable): Called with a session id; sessions it reports as
+            gone are dropped when stats are read.
+    """
+
+    def __init__(self, exists=_session_exists):
+        self.exists = exists
+        self._sizes = {}  # session id -> (bytes, measured_at)
+        self._lock = threading.Lock()
+
+    def record(self, session_id, state):
+        """
+        Measure a session's state and remember the result.
+        Args:
+            session_id (str): Streamlit session id.
+            state (dict): The session state, e.g. ``st.session_state.to_dict()``.
+        Returns:
+            int: The measured size in bytes.
+        """
+        size = deep_sizeof(state)
+        with self._lock:
+            self._sizes[session_id] = (size, time.time())
+        return size
+
+    def forget(self, session_id):
+        """Drop the figure of a session that has ended."""
+        with self._lock:
+            self._sizes.pop(session_id, None)
+
+    def stats(self):
+        """
+        Summarize the memory held by live sessions.
+        Returns:
+            dict: Number of sessions, and average, maximum and total bytes.
+        """
+        with self._lock:
+            session_ids = list(self._sizes)
+        for session_id in session_ids:
+            if not self.exists(session_id):
+                self.forget(session_id)
+        with self._lock:
+            sizes = [size for size, _ in self._sizes.values()]
+        return {
+            "sessions": len(sizes),
+            "average_bytes": sum(sizes) / len(sizes) if sizes else 0.0,
+            "max_bytes": max(sizes, default=0),
+            "total_bytes": sum(sizes),
+        }
+
+
+# ✅ Shared accounting for every session of the app
+session_memory = SessionMemory()
@@ -0,0 +1,341 @@
+"""Spill idle sessions to disk and resume them from a token in the URL.
+
+Respondents often leave the assessment half-finished. Their Streamlit session,
+with every widget value, stays in server memory until it expires, and a new
+visit starts from scratch. Instead, once the respondent is past the landing
+page the script gives the session a resume token, puts it in the page URL as
+``?resume=<token>`` and hands its resumable state (progress flags, answer
+vector, current question, respondent details) to ``session_spill`` after every
+run. The state is a few hundred bytes of JSON.
+
+A background sweeper, waking every ``VN_SESSION_SWEEP_SECONDS`` (default 30),
+spills sessions idle for ``VN_SESSION_IDLE_SECONDS`` (default 600): their state
+is written to a local SQLite store, then
+
+- a session whose tab is still open is asked to rerun; that run stores its
+  state once more, clears its session state and shows a "continue" button;
+- a disconnected session is closed right away.
+
+A run without session state and with a known token in the URL (a refresh, a
+reconnect, a bookmark, or the next click in a spilled tab) restores the state
+and carries on at the same section and question: the state of a session still
+tracked in memory is handed over directly, otherwise it is read from the
+store. A record is deleted once it has been resumed (the resumed session is
+tracked in memory again); records never resumed are deleted after
+``VN_SESSION_RETENTION_DAYS`` (default 30).
+
+Tokens expire ``VN_SESSION_TOKEN_DAYS`` (default 7) after they were issued,
+whatever the session did since: each token carries its issue time, an expired
+token resumes nothing and its saved record is deleted (on the attempt or by the
+next sweep), and a session still open past the expiry is given a new token.
+
+Privacy: the stored state includes the respondent's details (first and last
+name, email, organization and business unit) in plain text, alongside the
+answers. They stay on disk only while the session is away, at most until the
+token expires or the retention period ends, but the database should sit on storage as protected as the
+response store, and ``VN_SESSION_RETENTION_DAYS`` should be lowered where the
+data protection policy asks for shorter retention.
+
+The database path defaults to ``sessions.db`` next to this file and can be
+changed with the ``VN_SESSION_DB`` environment variable.
+"""
+import copy  # Resumed state is handed over as a copy
+import json  # For the stored state
+import os  # For the database path and settings
+import secrets  # For resume tokens
+import sqlite3  # For the session store
+import threading  # For the sweeper
+import time  # For idle times
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DB_PATH = os.environ.get("VN_SESSION_DB", os.path.join(BASE_DIR, "sessions.db"))
+
+# Query parameter carrying the resume token
+RESUME_PARAM = "resume"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spilled_sessions (
+    token TEXT PRIMARY KEY,
+    spilled_at REAL NOT NULL,
+    state TEXT NOT NULL
+)
+"""
+
+
+def connect(path=DEFAULT_DB_PATH):
+    """
+    Open a connection to the session store, creating the schema if needed.
+    Args:
+        path (str): Database file.
+    Returns:
+        sqlite3.Connection: Connection in WAL mode.
+    """
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def new_token():
+    """Return a fresh, unguessable resume token, stamped with its issue time."""
+    return f"{int(time.time())}.{secrets.token_urlsafe(16)}"
+
+
+def token_issued_at(token):
+    """
+    Read the issue time stamped in a resume token.
+    Args:
+        token (str): Resume token.
+    Returns:
+        int: Issue time in seconds since the epoch, or None for a malformed token.
+    """
+    issued, _, secret = token.partition(".")
+    return int(issued) if issued.isdigit() and secret else None
+
+
+def _evict_session(session_id):
+    """
+    Free a Streamlit session: ask an open one to rerun (the script then clears
+    its own state) and close a disconnected one.
+    Returns:
+        bool: True if the session was asked to rerun.
+    """
+    from streamlit import runtime
+
+    if not runtime.exists():
+        return False
+    instance = runtime.get_instance()
+    active = instance._session_mgr.get_active_session_info(session_id)
+    if active is None:
+        instance.close_session(session_id)  # No-op for sessions already gone
+        return False
+    session = active.session
+    session._event_loop.call_soon_threadsafe(session.request_rerun, None)  # AppSession is driven from its event loop
+    return True
+
+
+class SessionSpill:
+    """
+    Tracks live sessions' resumable state and spills idle ones to SQLite.
+    Args:
+        path (str): Database file.
+        idle_seconds (float): Idle time after which a session is spilled.
+        sweep_interval (float): Seconds between sweeps.
+        retention_seconds (float): Age after which spilled records are deleted.
+        token_seconds (float): Age after which resume tokens expire.
+        evict (callable): Called with a spilled session's id to free it;
+            returns True if the session will clear itself on its next run.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH, idle_seconds=600, sweep_interval=30, retention_seconds=30 * 86400, token_seconds=7 * 86400, evict=_evict_session):
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self.sweep_interval = sweep_interval
+        self.retention_seconds = retention_seconds
+        self.token_seconds = token_seconds
+        self.evict = evict
+        self._sessions = {}  # session id -> [token, state, last seen]
+        self._spill_requests = set()  # Session ids asked to clear themselves
+        self._lock = threading.Lock()
+        self._thread = None
+        self.spilled = 0
+        self.resumed = 0
+        self.errors = 0
+
+    def _ensure_sweeper(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="session-spill-sweeper", daemon=True)
+                self._thread.start()
+
+    def expired(self, token):
+        """
+        Check whether a resume token is past its expiry (or malformed).
+        Args:
+            token (str): Resume token.
+        Returns:
+            bool: True if the token can no longer resume a session.
+        """
+        issued = token_issued_at(token)
+        return issued is None or issued < time.time() - self.token_seconds
+
+    def touch(self, session_id, token, state):
+        """
+        Record a session's latest resumable state and mark it active.
+        Args:
+            session_id (str): Streamlit session id.
+            token (str): The session's resume token.
+            state (dict): JSON-serializable resumable state.
+        """
+        self._ensure_sweeper()
+        with self._lock:
+            self._sessions[session_id] = [token, state, time.monotonic()]
+
+    def spill_requested(self, session_id):
+        """
+        Check, once, whether the sweeper asked this session to clear itself.
+        Args:
+            session_id (str): Streamlit session id.
+        Returns:
+            bool: True if the current run should spill the session.
+        """
+        with self._lock:
+            if session_id in self._spill_requests:
+                self._spill_requests.discard(session_id)
+                return True
+            return False
+
+    def save(self, token, state):
+        """Write a session's state to the store, replacing any earlier copy; nothing is kept for an expired token."""
+        if self.expired(token):
+            return
+        connection = connect(self.path)
+        try:
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO spilled_sessions (token, spilled_at, state) VALUES (?, ?, ?)",
+                    (token, time.time(), json.dumps(state, separators=(",", ":"))),
+                )
+        finally:
+            connection.close()
+
+    def spill(self, session_id, token, state):
+        """
+        Store a session's state and stop tracking it; called by the session's
+        own run before it clears its session state.
+        """
+        self.save(token, state)
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def load(self, token):
+        """
+        Take over the state saved under a resume token: from a session still
+        tracked in memory (a refresh or reconnect before the idle timeout),
+        which stops being tracked, or else from the store, whose record is
+        deleted. The resuming session is tracked again on its next touch.
+        Args:
+            token (str): Resume token from the URL.
+        Returns:
+            dict: The saved state, or None for an unknown or expired token.
+        """
+        if not token:
+            return None
+        if self.expired(token):
+            self._delete(token)
+            return None
+        with self._lock:
+            for session_id, (tracked_token, state, _) in self._sessions.items():
+                if tracked_token == token:
+                    del self._sessions[session_id]  # The old session would otherwise spill stale state later
+                    self.resumed += 1
+                    return copy.deepcopy(state)
+        if not os.path.exists(self.path):
+            return None
+        connection = connect(self.path)
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT state FROM spilled_sessions WHERE token = ? AND spilled_at >= ?",
+                    (token, time.time() - self.retention_seconds),
+                ).fetchone()
+                if row is not None:
+                    connection.execute("DELETE FROM spilled_sessions WHERE token = ?", (token,))
+        finally:
+            connection.close()
+        if row is None:
+            return None
+        with self._lock:
+            self.resumed += 1
+        return json.loads(row[0])
+
+    def _delete(self, token):
+        """Delete the record saved under a token, if any."""
+        if not os.path.exists(self.path):
+            return
+        connection = connect(self.path)
+        try:
+            with connection:
+                connection.execute("DELETE FROM spilled_sessions WHERE token = ?", (token,))
+        finally:
+            connection.close()
+
+    def sweep(self):
+        """
+        Spill every session idle for ``idle_seconds`` and delete records past
+        the retention period or saved under an expired token.
+        Returns:
+            int: Number of sessions spilled.
+        """
+        deadline = time.monotonic() - self.idle_seconds
+        with self._lock:
+            idle = {session_id: entry for session_id, entry in self._sessions.items() if entry[2] <= deadline}
+        spilled = 0
+        for session_id, (token, state, last_seen) in idle.items():
+            with self._lock:
+                entry = self._sessions.get(session_id)
+                if entry is None or entry[2] != last_seen:
+                    continue  # Active again since the scan
+                del self._sessions[session_id]
+                self._spill_requests.add(session_id)
+            try:
+                self.save(token, state)  # Saved here too, in case the session never runs again
+                if not self.evict(session_id):
+                    with self._lock:
+                        self._spill_requests.discard(session_id)
+            except Exception:
+                with self._lock:
+                    self._spill_requests.discard(session_id)
+                    self.errors += 1
+                continue
+            spilled += 1
+        with self._lock:
+            self.spilled += spilled
+        if os.path.exists(self.path):
+            connection = connect(self.path)
+            try:
+                with connection:
+                    now = time.time()
+                    connection.execute(
+                        # The token's issue time is its digits before the "."; malformed tokens read as 0
+                        "DELETE FROM spilled_sessions WHERE spilled_at < ? OR CAST(substr(token, 1, instr(token, '.') - 1) AS INTEGER) < ?",
+                        (now - self.retention_seconds, now - self.token_seconds),
+                    )
+            finally:
+                connection.close()
+        return spilled
+
+    def _run(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            try:
+                self.sweep()
+            except sqlite3.Error:
+                with self._lock:
+                    self.errors += 1
+
+    def stats(self):
+        """
+        Report spilling activity.
+        Returns:
+            dict: Sessions tracked in memory, sessions spilled and resumed,
+            errors, and the idle timeout.
+        """
+        with self._lock:
+            return {
+                "tracked": len(self._sessions),
+                "spilled": self.spilled,
+                "resumed": self.resumed,
+                "errors": self.errors,
+                "idle_seconds": self.idle_seconds,
+            }
+
+
+# ✅ Shared spill store, timed by VN_SESSION_IDLE_SECONDS, VN_SESSION_RETENTION_DAYS and VN_SESSION_TOKEN_DAYS
+session_spill = SessionSpill(
+    idle_seconds=float(os.environ.get("VN_SESSION_IDLE_SECONDS", "600")),
+    sweep_interval=float(os.environ.get("VN_SESSION_SWEEP_SECONDS", "30")),
+    retention_seconds=float(os.environ.get("VN_SESSION_RETENTION_DAYS", "30")) * 86400,
+    token_seconds=float(os.environ.get("VN_SESSION_TOKEN_DAYS", "7")) * 86400,
+)
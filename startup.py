@@ -0,0 +1,128 @@
+"""Cold-start helpers: background preloading of the report stack and an import-time report.
+
+The charting and PDF libraries are only needed on the results page, so
+virtual_narrative.py imports them lazily there. ``preload_report_stack`` lets a
+server import them in a background thread once the landing page has rendered,
+so the first respondent to reach the results page does not pay for the import.
+It is enabled by setting ``VN_PRELOAD_REPORT_STACK=1``.
+
+Run as a script to list the import time of every module the app imports at
+startup, measured in a fresh interpreter with ``python -X importtime``:
+
+    python startup.py --budget-ms 1500
+"""
+import argparse  # For the command-line interface
+import ast  # For finding the script's eager imports
+import importlib  # For preloading modules
+import os  # For paths and environment
+import subprocess  # For a fresh interpreter per measurement
+import sys  # For the interpreter path and exit status
+import threading  # For the background preload
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_PATH = os.path.join(BASE_DIR, "virtual_narrative.py")
+
+# Modules only the results page needs; imported lazily by the script
+REPORT_STACK = ("plotly.graph_objects", "fpdf", "report")
+
+_preload_lock = threading.Lock()
+_preload_thread = None
+
+
+def _preload():
+    for module in REPORT_STACK:
+        importlib.import_module(module)
+    import report
+
+    report.warm_up()  # Parse the font and logo as well
+
+
+def preload_report_stack(force=False):
+    """
+    Import the results-page stack in a background thread, once per process.
+    Args:
+        force (bool): Preload even if VN_PRELOAD_REPORT_STACK is not set.
+    Returns:
+        bool: True if a preload is running or has run.
+    """
+    global _preload_thread
+    if not force and os.environ.get("VN_PRELOAD_REPORT_STACK", "") not in ("1", "true", "yes"):
+        return False
+    with _preload_lock:
+        if _preload_thread is None:
+            _preload_thread = threading.Thread(target=_preload, name="report-stack-preload", daemon=True)
+            _preload_thread.start()
+    return True
+
+
+def script_imports(path=SCRIPT_PATH):
+    """
+    List the modules a script imports at top level, i.e. on every cold start.
+    Args:
+        path (str): Script to inspect.
+    Returns:
+        list: Module names, in import order.
+    """
+    with open(path, "r", encoding="utf-8") as file:
+        tree = ast.parse(file.read(), path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return modules
+
+
+def measure_imports(modules):
+    """
+    Import modules in a fresh interpreter and collect ``-X importtime`` figures.
+    Args:
+        modules (list): Modules to import, in order.
+    Returns:
+        list: (module, self_us, cumulative_us) for each requested module, as
+        reported by the interpreter; cumulative includes its dependencies not
+        already imported by an earlier module.
+    """
+    code = "; ".join(f"import {module}" for module in modules)
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    )
+    timings = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            timings[name] = (int(self_us), int(cumulative_us))
+    return [(module, *timings[module]) for module in modules if module in timings]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report import time per module for a cold start of the app.")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if eager imports exceed this many milliseconds")
+    parser.add_argument("--include-report-stack", action="store_true", help="Also time the lazily imported results-page stack")
+    args = parser.parse_args(argv)
+
+    eager = script_imports()
+    modules = eager + [module for module in REPORT_STACK if args.include_report_stack and module not in eager]
+    timings = measure_imports(modules)
+
+    print(f"{'module':<28}{'self ms':>10}{'cumulative ms':>16}")
+    eager_total = 0
+    for module, self_us, cumulative_us in timings:
+        lazy = " (lazy)" if module not in eager else ""
+        print(f"{module + lazy:<28}{self_us / 1000:>10.1f}{cumulative_us / 1000:>16.1f}")
+        if not lazy:
+            eager_total += cumulative_us
+    print(f"{'eager imports total':<28}{'':>10}{eager_total / 1000:>16.1f}")
+
+    if args.budget_ms is not None and eager_total / 1000 > args.budget_ms:
+        print(f"Cold-start imports take {eager_total / 1000:.0f} ms, over the {args.budget_ms:.0f} ms budget", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
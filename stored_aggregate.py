@@ -0,0 +1,139 @@
+"""Aggregates kept over every stored submission, next to the submissions.
+
+The cohort aggregates and the peer percentile sketches follow the same life
+cycle, implemented once here:
+
+- the response store's writer hands every batch to ``apply`` inside the
+  transaction that stores it; the aggregate adds the batch and persists the
+  parts it changed in the same transaction;
+- on first use the persisted state is loaded; when it is missing or does not
+  cover every stored submission, it is rebuilt with a one-off scan of the
+  submissions. A script thread (reader) rebuilds without writing, so it never
+  waits on the writer's lock, and the writer persists the rebuild with its
+  next batch;
+- a rolled-back transaction invalidates the in-memory state, which is then
+  reloaded from the committed state.
+
+Subclasses only say how to hold, fold in and serialize their data.
+"""
+import json  # For reading stored submissions
+import threading  # The writer thread and script threads share the aggregate
+
+import numpy as np
+
+from questionnaire import SECTIONS
+from response_store import connect, response_store
+from scoring import QUESTIONS_PER_SECTION, score_assessment, weights_vector
+
+
+def score_records(records):
+    """
+    Score submission records in one vectorized pass.
+    Args:
+        records (list): Dicts with ``answers`` (question key to score) and
+            ``weights`` (section title to weight), as given to the response store.
+    Returns:
+        scoring.Scores: Scores with one row per record.
+    """
+    answers = np.zeros((len(records), len(SECTIONS), QUESTIONS_PER_SECTION), dtype=np.float64)
+    weights = np.empty((len(records), len(SECTIONS)), dtype=np.float64)
+    for i, record in enumerate(records):
+        for row, section in enumerate(SECTIONS):
+            for column, question in enumerate(section.questions):
+                answers[i, row, column] = record["answers"][question.key]
+        weights[i] = weights_vector(record["weights"])
+    return score_assessment(answers, weights)
+
+
+class StoredAggregate:
+    """
+    Base of an aggregate over all submissions, kept current by the response
+    store's writer and persisted in the same database.
+    Subclasses implement:
+        _reset(): Start from an empty aggregate.
+        _read(connection): Load the persisted aggregate (empty if none).
+        _count(): Number of submissions the aggregate covers.
+        _add(records, scores): Fold in scored records; returns what changed,
+            handed to ``_save``.
+        _save(connection, changed): Persist the changed parts.
+        _save_all(connection): Persist the whole aggregate.
+    Args:
+        path (str): Database file shared with the response store; defaults to
+            the response store's.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._loaded = False
+        self._unsaved = False  # Rebuilt by a reader; the writer persists it on its next batch
+        self._lock = threading.Lock()
+
+    def _load(self, connection, pending=0, persist=True):
+        """
+        Load the persisted aggregate, rebuilding it from the submissions when
+        it is missing or does not cover every stored submission.
+        Args:
+            connection (sqlite3.Connection): Connection to the store.
+            pending (int): Submissions already inserted in the current
+                transaction but not yet aggregated.
+            persist (bool): Save a rebuilt aggregate now; only the writer does,
+                so readers never wait on its write lock.
+        Returns:
+            bool: True if the aggregate was rebuilt, in which case the pending
+            submissions are already included.
+        """
+        self._read(connection)
+        self._loaded = True
+        stored = connection.execute("SELECT COUNT(*) FROM submissions").fetchone()[0]
+        if self._count() == stored - pending:
+            return False
+
+        # Rebuild from the submissions (a one-off scan)
+        self._reset()
+        cursor = connection.execute("SELECT org_name, business_unit, answers, weights FROM submissions")
+        while rows := cursor.fetchmany(5000):
+            records = [{"org_name": org, "business_unit": unit, "answers": json.loads(answers), "weights": json.loads(weights)} for org, unit, answers, weights in rows]
+            self._add(records, score_records(records))
+        if persist:
+            self._save_all(connection)
+            self._unsaved = False
+        else:
+            self._unsaved = True
+        return True
+
+    def apply(self, connection, records):
+        """
+        Response store listener: add a committed batch of submissions.
+        Args:
+            connection (sqlite3.Connection): The writer's connection, inside
+                the transaction storing ``records``.
+            records (list): Submission records.
+        """
+        with self._lock:
+            if not self._loaded and self._load(connection, pending=len(records)):
+                return
+            changed = self._add(records, score_records(records))
+            if self._unsaved:
+                self._save_all(connection)
+                self._unsaved = False
+            else:
+                self._save(connection, changed)
+
+    def invalidate(self):
+        """Response store rollback hook: reload from the committed state on next use."""
+        with self._lock:
+            self._loaded = False
+
+    def attach(self, store=response_store):
+        """Keep the aggregate current with a response store's writes."""
+        store.add_listener(self.apply, on_rollback=self.invalidate)
+
+    def _ensure_loaded(self):
+        # Called with the lock held, by readers
+        if self._loaded:
+            return
+        connection = connect(self.path or response_store.path)
+        try:
+            self._load(connection, persist=False)
+        finally:
+            connection.close()
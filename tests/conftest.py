@@ -0,0 +1,5 @@
+"""Make the app's top-level modules importable from the tests."""
+import os  # For the repository root
+import sys  # For the import path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,76 @@
+"""Rank error bounds of the KLL quantile sketch."""
+import bisect
+import random
+
+import pytest
+
+from quantile_sketch import KLLSketch
+
+K = 200
+MAX_RANK_ERROR = 2.5 / K  # The module documents about 1.7/k; leave room for the coin flips
+
+
+def true_rank(ordered, value):
+    return bisect.bisect_left(ordered, value) / len(ordered)
+
+
+def max_rank_error(sketch, values):
+    ordered = sorted(values)
+    probes = [ordered[int(fraction * (len(ordered) - 1))] for fraction in [i / 100 for i in range(101)]]
+    return max(abs(sketch.rank(value) - true_rank(ordered, value)) for value in probes)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_rank_error_of_a_stream(seed):
+    stream = random.Random(seed)
+    values = [stream.gauss(3.0, 0.8) for _ in range(100_000)]
+    sketch = KLLSketch(K, seed=seed)
+    sketch.extend(values)
+    assert sketch.n == len(values)
+    assert max_rank_error(sketch, values) <= MAX_RANK_ERROR
+
+
+def test_rank_error_of_sorted_input():
+    values = [i / 1000 for i in range(50_000)]  # Sorted input is the worst case for naive sampling
+    sketch = KLLSketch(K, seed=5)
+    sketch.extend(values)
+    assert max_rank_error(sketch, values) <= MAX_RANK_ERROR
+
+
+def test_merged_sketches_keep_the_bound():
+    stream = random.Random(11)
+    parts = [[stream.uniform(1, 5) for _ in range(20_000)] for _ in range(5)]
+    merged = KLLSketch(K, seed=0)
+    for i, part in enumerate(parts):
+        sketch = KLLSketch(K, seed=i + 1)
+        sketch.extend(part)
+        merged.merge(sketch)
+    values = [value for part in parts for value in part]
+    assert merged.n == len(values)
+    assert max_rank_error(merged, values) <= MAX_RANK_ERROR
+
+
+def test_quantiles_invert_ranks():
+    stream = random.Random(4)
+    values = [stream.uniform(1, 5) for _ in range(30_000)]
+    sketch = KLLSketch(K, seed=4)
+    sketch.extend(values)
+    ordered = sorted(values)
+    for fraction in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert abs(true_rank(ordered, sketch.quantile(fraction)) - fraction) <= MAX_RANK_ERROR
+
+
+def test_serialized_sketch_answers_the_same():
+    stream = random.Random(9)
+    sketch = KLLSketch(K, seed=9)
+    sketch.extend(stream.uniform(1, 5) for _ in range(10_000))
+    restored = KLLSketch.from_bytes(sketch.to_bytes())
+    assert restored.n == sketch.n
+    for value in (1.5, 2.5, 3.0, 4.5):
+        assert restored.rank(value) == sketch.rank(value)
+
+
+def test_empty_sketch():
+    sketch = KLLSketch(K)
+    assert sketch.rank(3.0) == 0.0
+    assert sketch.quantile(0.5) is None
@@ -0,0 +1,48 @@
+"""Byte-budget eviction of the PDF report cache."""
+from report import ReportCache
+
+
+def test_least_recently_used_reports_are_evicted_over_budget():
+    cache = ReportCache(max_bytes=100)
+    cache.put("a", b"x" * 40)
+    cache.put("b", b"x" * 40)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("c", b"x" * 40)
+    assert "a" in cache and "c" in cache and "b" not in cache
+    assert cache.size == 80
+    assert cache.stats()["evictions"] == 1
+
+
+def test_size_never_exceeds_the_budget():
+    cache = ReportCache(max_bytes=1000)
+    for i in range(200):
+        cache.put(str(i), b"x" * (37 * i % 300 + 1))
+        assert cache.size <= cache.max_bytes
+        assert cache.size == sum(len(cache.get(key)) for key in list(cache._reports))
+
+
+def test_replacing_a_report_counts_its_new_size_only():
+    cache = ReportCache(max_bytes=100)
+    cache.put("a", b"x" * 60)
+    cache.put("a", b"x" * 30)
+    assert cache.size == 30
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["evictions"] == 0
+
+
+def test_a_report_larger_than_the_budget_is_not_cached():
+    cache = ReportCache(max_bytes=100)
+    cache.put("a", b"x" * 50)
+    cache.put("huge", b"x" * 101)
+    assert "huge" not in cache
+    assert "a" in cache
+    assert cache.size == 50
+
+
+def test_clear_resets_size_and_counters():
+    cache = ReportCache(max_bytes=100)
+    cache.put("a", b"x" * 60)
+    cache.get("a")
+    cache.get("missing")
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "bytes": 0, "max_bytes": 100, "hits": 0, "misses": 0, "evictions": 0}
@@ -0,0 +1,71 @@
+"""The response store's writer after a submission that cannot be stored."""
+import sqlite3
+
+import pytest
+
+from questionnaire import SECTIONS, WEIGHTING_QUESTIONS
+from response_store import ResponseStore
+from scoring import SECTION_TITLES
+
+
+def record(name):
+    return {
+        "first_name": name,
+        "answers": {question.key: 3 for section in SECTIONS for question in section.questions},
+        "priorities": {question.key: 3 for question in WEIGHTING_QUESTIONS},
+        "weights": {title: 1 / len(SECTION_TITLES) for title in SECTION_TITLES},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResponseStore(path=str(tmp_path / "responses.db"), flush_interval=0.05)
+    yield store
+    store.close()
+
+
+def stored_names(store):
+    connection = sqlite3.connect(store.path)
+    try:
+        return [name for (name,) in connection.execute("SELECT first_name FROM submissions ORDER BY id")]
+    finally:
+        connection.close()
+
+
+def test_bad_record_is_skipped_and_the_rest_of_its_batch_stored(store):
+    bad = record("bad")
+    del bad["answers"]
+    for item in (record("a"), bad, record("b")):
+        store.submit(item)
+    store.flush()  # Would hang if the bad record killed the writer
+    assert stored_names(store) == ["a", "b"]
+    assert store.stats()["rejected"] == 1
+    assert store.stats()["written"] == 2
+
+
+def test_writer_keeps_serving_after_a_bad_record(store):
+    store.submit({"first_name": "bad", "answers": {1, 2}, "weights": {}})  # A set is not JSON-serializable
+    store.flush()
+    store.submit(record("later"))
+    store.flush()
+    assert stored_names(store) == ["later"]
+    assert store._thread.is_alive()
+
+
+def test_close_after_a_bad_record_returns_and_flushes(store):
+    store.submit({"first_name": "bad"})
+    store.submit(record("last"))
+    store.close()
+    assert store._thread is None
+    assert stored_names(store) == ["last"]
+
+
+def test_failing_listener_does_not_lose_submissions(store):
+    def broken(connection, records):
+        raise RuntimeError("listener bug")
+
+    store.add_listener(broken)
+    store.submit(record("kept"))
+    store.flush()
+    assert stored_names(store) == ["kept"]
+    assert store.stats()["listener_errors"] == 1
@@ -0,0 +1,73 @@
+"""The vectorized scoring against the app's original per-respondent logic."""
+import numpy as np
+import pytest
+
+from questionnaire import SECTIONS
+from scoring import (MATURITY_LEVELS, QUESTIONS_PER_SECTION, SECTION_TITLES,
+                     maturity_level_index, score_assessment, weights_from_priorities)
+
+
+def original_level(weighted_avg_score):
+    """The if/elif chain the results page used before scoring was vectorized."""
+    if weighted_avg_score <= 1.5:
+        return "Initial/Ad Hoc"
+    elif weighted_avg_score <= 2.5:
+        return "Developing"
+    elif weighted_avg_score <= 3.5:
+        return "Defined"
+    elif weighted_avg_score <= 4.5:
+        return "Managed"
+    else:
+        return "Optimized"
+
+
+def original_scores(answers, priorities):
+    """Section means, weighted scores and their sum, one respondent at a time."""
+    total = sum(priorities)
+    weights = {title: priority / total for title, priority in zip(SECTION_TITLES, priorities)}
+    section_scores = {
+        section.title: sum(answers[row][:len(section.questions)]) / len(section.questions)
+        for row, section in enumerate(SECTIONS)
+    }
+    weighted_scores = {title: score * weights[title] for title, score in section_scores.items()}
+    return section_scores, weighted_scores, sum(weighted_scores.values())
+
+
+@pytest.mark.parametrize("score, label", [
+    (1.0, "Initial/Ad Hoc"), (1.5, "Initial/Ad Hoc"), (1.51, "Developing"),
+    (2.5, "Developing"), (3.5, "Defined"), (3.5000001, "Managed"),
+    (4.5, "Managed"), (4.51, "Optimized"), (5.0, "Optimized"),
+])
+def test_thresholds_match_the_original_chain(score, label):
+    assert original_level(score) == label
+    assert MATURITY_LEVELS[int(maturity_level_index(score))].label == label
+    assert MATURITY_LEVELS[int(maturity_level_index(np.array([score]))[0])].label == label
+
+
+def test_batch_scores_match_the_original_logic():
+    rng = np.random.default_rng(7)
+    n = 2000
+    answers = np.zeros((n, len(SECTIONS), QUESTIONS_PER_SECTION))
+    for row, section in enumerate(SECTIONS):
+        answers[:, row, :len(section.questions)] = rng.integers(1, 6, (n, len(section.questions)))
+    priorities = rng.integers(1, 6, (n, len(SECTIONS)))
+
+    scores = score_assessment(answers, weights_from_priorities(priorities))
+
+    for i in range(n):
+        section_scores, weighted_scores, overall = original_scores(answers[i].tolist(), priorities[i].tolist())
+        np.testing.assert_allclose(scores.section_scores[i], list(section_scores.values()), rtol=1e-12)
+        np.testing.assert_allclose(scores.weighted_scores[i], list(weighted_scores.values()), rtol=1e-12)
+        assert scores.overall[i] == pytest.approx(overall, rel=1e-12)
+        if min(abs(overall - threshold) for threshold in (1.5, 2.5, 3.5, 4.5)) > 1e-9:  # Summation order may tip an exact tie
+            assert MATURITY_LEVELS[scores.level[i]].label == original_level(overall)
+
+
+def test_single_assessment_matches_its_row_in_a_batch():
+    rng = np.random.default_rng(3)
+    answers = rng.integers(1, 6, (50, len(SECTIONS), QUESTIONS_PER_SECTION)).astype(float)
+    weights = weights_from_priorities(rng.integers(1, 6, (50, len(SECTIONS))))
+    batch = score_assessment(answers, weights)
+    single = score_assessment(answers[17], weights[17])
+    assert single.overall == batch.overall[17]
+    assert single.level == batch.level[17]